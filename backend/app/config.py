@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     # Indexing
     reindex_interval_minutes: int = 30  # 0 = disabled
 
+    # PDF export
+    pdf_workers: int = 2  # Processes rendering PDFs in parallel
+
     # Logging
     log_level: str = "INFO"
 
@@ -1,9 +1,13 @@
 """Database configuration and connection management."""
 import logging
+import os
 import time
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy import text, event
+from sqlalchemy import text, event, inspect
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
@@ -22,57 +26,189 @@ SQLITE_PRAGMAS = [
     "PRAGMA busy_timeout=5000",     # Wait 5s for locks instead of failing immediately
     "PRAGMA synchronous=NORMAL",    # Good balance of safety and speed
     "PRAGMA foreign_keys=ON",       # Enforce foreign key constraints
+    "PRAGMA temp_store=MEMORY",     # Keep sort/group-by temp tables in memory
+    "PRAGMA cache_size=-65536",     # 64MB page cache (negative = KiB)
+    "PRAGMA mmap_size=268435456",   # Memory-map up to 256MB of the database file
 ]
 
-engine = create_async_engine(
+# Read-only connections skip the (persistent) journal mode switch, which the
+# writer already applied, and refuse any statement that would modify the DB
+READ_PRAGMAS = [p for p in SQLITE_PRAGMAS if "journal_mode" not in p] + [
+    "PRAGMA query_only=ON",
+]
+
+# Readers scale with cores; SQLite allows a single writer, so serialize writes
+# through a pool of one connection instead of retrying on SQLITE_BUSY.
+# Some endpoints fan out over several read connections, so allow overflow
+# to keep concurrent requests from starving each other.
+READ_POOL_SIZE = max(os.cpu_count() or 1, 4)
+READ_MAX_OVERFLOW = READ_POOL_SIZE
+
+# Pooled connections are long-lived and keep their page cache between
+# requests. A local SQLite file can't drop a connection the way a network
+# server can, so skip the pre-ping round trip on every checkout.
+read_engine = create_async_engine(
     settings.database_url,
     echo=False,
-    pool_pre_ping=True,  # Check connections before use
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=READ_POOL_SIZE,
+    max_overflow=READ_MAX_OVERFLOW,
+    pool_use_lifo=True,  # Reuse the most recent (cache-warm) connection first
     connect_args={"timeout": 30},  # Connection timeout
 )
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+write_engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=1,
+    max_overflow=0,
+    connect_args={"timeout": 30},
+)
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+write_session = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _register_events(engine, pragmas: list[str]):
+    """Attach pragma and slow-query listeners to an engine."""
+    pragma_script = ";\n".join(pragmas) + ";"
+
+    # Apply pragmas on connection
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        """Apply SQLite pragmas on connection in a single driver call."""
+        dbapi_connection.run_async(lambda conn: conn.executescript(pragma_script))
 
+    # Log slow queries
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Track query start time."""
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
-# Apply pragmas on connection
-@event.listens_for(engine.sync_engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Apply SQLite pragmas on connection."""
-    cursor = dbapi_connection.cursor()
-    for pragma in SQLITE_PRAGMAS:
-        cursor.execute(pragma)
-    cursor.close()
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Log slow queries."""
+        start_time = conn.info["query_start_time"].pop()
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if duration_ms > 500:  # Log queries over 500ms
+            logger.warning("[DB] Slow query (%.0fms): %.100s", duration_ms, statement)
 
 
-# Log slow queries
-@event.listens_for(engine.sync_engine, "before_cursor_execute")
-def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    """Track query start time."""
-    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+_register_events(read_engine, READ_PRAGMAS)
+_register_events(write_engine, SQLITE_PRAGMAS)
 
 
-@event.listens_for(engine.sync_engine, "after_cursor_execute")
-def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    """Log slow queries."""
-    start_time = conn.info["query_start_time"].pop()
-    duration_ms = (time.perf_counter() - start_time) * 1000
-    if duration_ms > 500:  # Log queries over 500ms
-        logger.warning(f"[DB] Slow query ({duration_ms:.0f}ms): {statement[:100]}")
+# The sqlite3 driver defers BEGIN until the first DML statement, so a
+# SAVEPOINT issued first would open the transaction itself and its RELEASE
+# would commit. Let SQLAlchemy emit BEGIN on the writer instead, so nested
+# savepoints (used for per-session rollback while indexing) stay inside one
+# real transaction.
+@event.listens_for(write_engine.sync_engine, "connect")
+def _disable_driver_begin(dbapi_connection, connection_record):
+    """Turn off the driver's implicit transaction handling."""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(write_engine.sync_engine, "begin")
+def _emit_begin(conn):
+    """Start transactions explicitly."""
+    conn.exec_driver_sql("BEGIN")
 
 
 async def get_db():
-    """Dependency for getting database sessions."""
-    async with async_session() as session:
+    """Dependency for getting read-only database sessions."""
+    async with read_session() as session:
+        yield session
+
+
+async def get_write_db():
+    """Dependency for getting database sessions that write."""
+    async with write_session() as session:
         yield session
 
 
+# Full-text index over the session search fields. The trigram tokenizer
+# gives case-insensitive substring matching, like the ILIKE search it
+# replaces. External content keeps the text stored only in `sessions`, and
+# triggers keep the index in sync.
+#
+# The index is keyed on the implicit `sessions.rowid`: the primary key is
+# the TEXT session id, and giving the table an INTEGER PRIMARY KEY rowid
+# alias would mean rebuilding it. VACUUM may renumber implicit rowids behind
+# the triggers' back, so the index is checked against its content table at
+# startup and rebuilt if the two have drifted apart.
+SESSIONS_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+        display, project, cwd,
+        content='sessions', content_rowid='rowid', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_ai AFTER INSERT ON sessions BEGIN
+        INSERT INTO sessions_fts(rowid, display, project, cwd)
+        VALUES (new.rowid, new.display, new.project, new.cwd);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_ad AFTER DELETE ON sessions BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, display, project, cwd)
+        VALUES ('delete', old.rowid, old.display, old.project, old.cwd);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS sessions_fts_au AFTER UPDATE ON sessions BEGIN
+        INSERT INTO sessions_fts(sessions_fts, rowid, display, project, cwd)
+        VALUES ('delete', old.rowid, old.display, old.project, old.cwd);
+        INSERT INTO sessions_fts(rowid, display, project, cwd)
+        VALUES (new.rowid, new.display, new.project, new.cwd);
+    END""",
+]
+SESSIONS_FTS_REBUILD = "INSERT INTO sessions_fts(sessions_fts) VALUES ('rebuild')"
+# rank = 1 also compares the index with the rows in `sessions`
+SESSIONS_FTS_INTEGRITY_CHECK = "INSERT INTO sessions_fts(sessions_fts, rank) VALUES ('integrity-check', 1)"
+
+
+def _create_schema(sync_conn):
+    """Create tables, any columns or indexes missing from existing tables, and the FTS index."""
+    Base.metadata.create_all(sync_conn)
+
+    # create_all skips columns added to tables that already exist. New
+    # columns are either nullable or NOT NULL with a server default, so an
+    # ADD COLUMN with the column's own DDL brings older databases up to date.
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_ddl = CreateColumn(column).compile(dialect=sync_conn.dialect)
+                sync_conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+                logger.info("[DB] Added column %s.%s", table.name, column.name)
+
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    fts_exists = sync_conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions_fts'")
+    ).first()
+    for statement in SESSIONS_FTS_DDL:
+        sync_conn.execute(text(statement))
+
+    # Populate the index from rows indexed before it existed, or repair it
+    if not fts_exists:
+        sync_conn.execute(text(SESSIONS_FTS_REBUILD))
+    else:
+        try:
+            # Savepoint, so a failed check doesn't disturb the schema transaction
+            with sync_conn.begin_nested():
+                sync_conn.execute(text(SESSIONS_FTS_INTEGRITY_CHECK))
+        except DatabaseError:
+            logger.warning("[DB] Full-text index out of sync with sessions, rebuilding")
+            sync_conn.execute(text(SESSIONS_FTS_REBUILD))
+
+
 async def init_db():
     """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(_create_schema)
     logger.info("[DB] Database initialized")
 
 
 async def ping_db():
     """Check database connection."""
-    async with async_session() as session:
+    async with read_session() as session:
         await session.execute(text("SELECT 1"))
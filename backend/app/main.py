@@ -1,17 +1,19 @@
 """Main FastAPI application."""
 import asyncio
+import itertools
 import logging
 import time
-import uuid
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select, func
 
-from app.database import init_db, ping_db, async_session
+from app.database import init_db, ping_db, write_session
 from app.config import settings
 from app.routers import sessions, messages, subagents, index, export
+from app.routers.export import shutdown_pdf_pool
 from app.models import Session
 from app.services.indexer import index_all_sessions
 
@@ -24,22 +26,42 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for background startup work when shutting down
+SHUTDOWN_TIMEOUT_SECONDS = 5
+
+# Sequential request IDs for correlating request/response log lines
+_REQUEST_COUNTER = itertools.count()
+
 
 async def periodic_reindex(interval_minutes: int):
     """Background task that periodically re-indexes sessions."""
     interval_seconds = interval_minutes * 60
-    logger.info(f"[App] Periodic re-indexing enabled every {interval_minutes} minutes")
+    logger.info("[App] Periodic re-indexing enabled every %s minutes", interval_minutes)
     while True:
         await asyncio.sleep(interval_seconds)
         logger.info("[App] Starting periodic re-index...")
         try:
-            async with async_session() as db:
+            async with write_session() as db:
                 await index_all_sessions(db, force=False)
             logger.info("[App] Periodic re-index complete")
         except Exception:
             logger.exception("[App] Periodic re-index failed")
 
 
+async def initial_index():
+    """Background task that indexes sessions if the database is empty."""
+    try:
+        async with write_session() as db:
+            result = await db.execute(select(func.count()).select_from(Session))
+            count = result.scalar() or 0
+
+            if count == 0:
+                logger.info("[App] Database is empty, starting initial indexing...")
+                await index_all_sessions(db, force=False)
+    except Exception:
+        logger.exception("[App] Initial indexing failed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
@@ -52,14 +74,9 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
 
-    # Check if database is empty and trigger initial indexing
-    async with async_session() as db:
-        result = await db.execute(select(func.count()).select_from(Session))
-        count = result.scalar() or 0
-
-        if count == 0:
-            logger.info("[App] Database is empty, starting initial indexing...")
-            await index_all_sessions(db, force=False)
+    # Index an empty database in the background so requests are served
+    # (with partial results) while it runs
+    app.state.init_task = asyncio.create_task(initial_index())
 
     # Start periodic re-indexing background task
     reindex_task = None
@@ -69,10 +86,16 @@ async def lifespan(app: FastAPI):
         )
 
     elapsed_ms = int((time.monotonic() - start_time) * 1000)
-    logger.info(f"[App] Startup complete ({elapsed_ms}ms)")
+    logger.info("[App] Startup complete (%sms)", elapsed_ms)
 
     yield
 
+    # Give initial indexing a moment to finish, then cancel it
+    try:
+        await asyncio.wait_for(app.state.init_task, timeout=SHUTDOWN_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        pass
+
     # Cancel periodic re-indexing on shutdown
     if reindex_task is not None:
         reindex_task.cancel()
@@ -81,6 +104,8 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    shutdown_pdf_pool()
+
     logger.info("[App] Shutting down Session Viewer API")
 
 
@@ -89,6 +114,7 @@ app = FastAPI(
     description="API for viewing Claude Code and Codex AI assistant sessions",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -96,33 +122,42 @@ app = FastAPI(
 @app.middleware("http")
 async def log_requests(request, call_next):
     """Log all HTTP requests with timing."""
-    request_id = uuid.uuid4().hex[:8]
-    start = time.perf_counter()
+    # Skip logging for OPTIONS requests; CORS preflights never get here
+    if request.method == "OPTIONS":
+        return await call_next(request)
+
+    request_id = f"{next(_REQUEST_COUNTER) & 0xFFFFFFFF:08x}"
+    start = time.monotonic_ns()
 
     # Log incoming request
     content_length = request.headers.get("content-length", "0")
     logger.info(
-        f"[REQUEST] {request_id} --> {request.method} {request.url.path} (body={content_length}b)"
+        "[REQUEST] %s --> %s %s (body=%sb)",
+        request_id, request.method, request.url.path, content_length,
     )
 
     try:
         response = await call_next(request)
     except Exception:
-        duration_ms = int((time.perf_counter() - start) * 1000)
+        duration_ms = (time.monotonic_ns() - start) // 1_000_000
         logger.exception(
-            f"[REQUEST] {request_id} <-- {request.method} {request.url.path} EXCEPTION in {duration_ms}ms"
+            "[REQUEST] %s <-- %s %s EXCEPTION in %sms",
+            request_id, request.method, request.url.path, duration_ms,
         )
         raise
 
-    duration_ms = int((time.perf_counter() - start) * 1000)
+    duration_ms = (time.monotonic_ns() - start) // 1_000_000
     logger.info(
-        f"[REQUEST] {request_id} <-- {response.status_code} {request.method} {request.url.path} ({duration_ms}ms)"
+        "[REQUEST] %s <-- %s %s %s (%sms)",
+        request_id, response.status_code, request.method, request.url.path, duration_ms,
     )
 
     return response
 
 
-# CORS middleware
+# CORS middleware. Middleware added last runs first, so registering this
+# after log_requests keeps it outermost and preflights are answered before
+# reaching the logger.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -148,10 +183,19 @@ async def healthz():
         await ping_db()
         return {"status": "ok"}
     except Exception as e:
-        logger.error(f"[Health] Database check failed: {e}")
+        logger.error("[Health] Database check failed: %s", e)
         return {"status": "error", "message": str(e)}
 
 
+# Readiness endpoint
+@app.get(f"{settings.api_prefix}/readyz")
+async def readyz():
+    """Readiness check: ready once startup indexing has finished."""
+    if not app.state.init_task.done():
+        return ORJSONResponse({"status": "indexing"}, status_code=503)
+    return {"status": "ready"}
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -1,15 +1,15 @@
 """SQLAlchemy ORM models for session storage."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, ForeignKey, Boolean, Integer, Index
+from sqlalchemy import String, Text, ForeignKey, Boolean, Integer, Index, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
 def generate_uuid() -> str:
-    """Generate a UUID string."""
-    return str(uuid.uuid4())
+    """Generate a UUID string (32 hex chars, no hyphens)."""
+    return uuid.uuid4().hex
 
 
 class Session(Base):
@@ -28,6 +28,7 @@ class Session(Base):
     subagent_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     has_tool_results: Mapped[bool] = mapped_column(Boolean, default=False)
     file_path: Mapped[str] = mapped_column(Text, nullable=False)  # Absolute path to source .jsonl
+    file_mtime_ns: Mapped[int | None] = mapped_column(Integer, nullable=True)  # Source file mtime when indexed
     indexed_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     # Relationships
@@ -54,6 +55,8 @@ class Session(Base):
         Index("idx_sessions_project", "project"),
         Index("idx_sessions_created_at", "created_at"),
         Index("idx_sessions_display", "display"),
+        Index("idx_sessions_source_created", "source", "created_at"),  # Filter by source, newest first
+        Index("idx_sessions_file_path", "file_path"),  # Already-indexed lookups during re-index
     )
 
 
@@ -94,6 +97,7 @@ class Subagent(Base):
     message_count: Mapped[int] = mapped_column(Integer, default=0)
     first_message: Mapped[str | None] = mapped_column(Text, nullable=True)  # Preview
     file_path: Mapped[str | None] = mapped_column(Text, nullable=True)  # Path to subagent .jsonl
+    parsed_mtime_ns: Mapped[int | None] = mapped_column(Integer, nullable=True)  # File mtime when messages were cached
 
     # Relationships
     session: Mapped["Session"] = relationship(back_populates="subagents")
@@ -132,6 +136,7 @@ class AssociatedFile(Base):
     session_id: Mapped[str] = mapped_column(String, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False)
     file_type: Mapped[str] = mapped_column(String, nullable=False)  # 'todo', 'plan', 'debug'
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    truncated: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)  # Content cut at the size limit
     file_path: Mapped[str] = mapped_column(Text, nullable=False)
 
     # Relationships
@@ -1,17 +1,26 @@
 """Export API endpoints."""
 
+import asyncio
 import logging
-from datetime import datetime
+import multiprocessing
+import os
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
+from app.config import settings
 from app.database import get_db
 from app.models import Session, Message
-from app.services.pdf_export import generate_pdf
+from app.services.pdf_export import render_pdf_file
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +31,70 @@ class ExportRequest(BaseModel):
     session_ids: list[str]
 
 
+# Number of message rows buffered per fetch while streaming messages
+EXPORT_MESSAGE_BATCH_SIZE = 500
+
+# Size of each chunk written to the response body
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Worker processes for WeasyPrint, created on first export. Rendering is
+# CPU-bound pure Python, so threads would serialize on the GIL; spawned (not
+# forked) workers don't inherit the event loop, threads or DB connections
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the PDF worker pool, starting it if needed."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max(settings.pdf_workers, 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the PDF worker pool, if it was started, without waiting on it."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next render starts a fresh one.
+
+    Only the given pool is touched: a concurrent request may already have
+    replaced it, and that replacement must keep running.
+    """
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    # Already broken, so there is nothing left to wait for or cancel
+    pool.shutdown(wait=False)
+
+
+async def _render_pdf(sessions_data: list[dict], pdf_path: str) -> None:
+    """Render a PDF in the worker pool, rebuilding the pool once if it broke."""
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    try:
+        await loop.run_in_executor(pool, render_pdf_file, sessions_data, pdf_path)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); the pool rejects all further work
+        logger.warning("PDF worker pool broke, restarting it")
+        _discard_pdf_pool(pool)
+        await loop.run_in_executor(_get_pdf_pool(), render_pdf_file, sessions_data, pdf_path)
+
+
+def _iter_file(f: BinaryIO) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing it when done."""
+    with f:
+        while chunk := f.read(PDF_CHUNK_SIZE):
+            yield chunk
+
+
 @router.post("/export/pdf")
 async def export_sessions_pdf(
     body: ExportRequest,
@@ -34,44 +107,49 @@ async def export_sessions_pdf(
     if len(body.session_ids) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 sessions per export")
 
-    sessions_data: list[dict] = []
+    session_ids = list(dict.fromkeys(body.session_ids))
+
+    # Fetch all sessions in one query
+    result = await db.execute(select(Session).where(Session.id.in_(session_ids)))
+    sessions_by_id = {session.id: session for session in result.scalars()}
 
     for sid in body.session_ids:
-        # Fetch session
-        result = await db.execute(select(Session).where(Session.id == sid))
-        session = result.scalar_one_or_none()
-        if not session:
+        if sid not in sessions_by_id:
             raise HTTPException(status_code=404, detail=f"Session {sid} not found")
 
-        # Fetch messages in order
-        msg_result = await db.execute(
-            select(Message)
-            .where(Message.session_id == sid)
-            .order_by(Message.sequence)
-        )
-        messages = msg_result.scalars().all()
+    # Stream all messages in one ordered query, selecting only the columns
+    # the PDF renders and converting each batch to plain dicts so rows are
+    # released instead of held for the whole export. Timestamps stay
+    # datetimes; the PDF formats them directly without an ISO round trip
+    messages_by_session: dict[str, list[dict]] = {sid: [] for sid in session_ids}
+    msg_result = await db.stream(
+        select(Message.session_id, Message.type, Message.content, Message.timestamp)
+        .where(Message.session_id.in_(session_ids), Message.agent_id.is_(None))
+        .order_by(Message.session_id, Message.sequence)
+        .execution_options(yield_per=EXPORT_MESSAGE_BATCH_SIZE)
+    )
+    async for m in msg_result:
+        messages_by_session[m.session_id].append({
+            "type": m.type,
+            "content": m.content,
+            "timestamp": m.timestamp,
+        })
 
+    # Assemble in the requested order
+    sessions_data: list[dict] = []
+    for sid in body.session_ids:
+        session = sessions_by_id[sid]
         sessions_data.append({
             "source": session.source,
             "display": session.display,
             "project": session.project,
             "cwd": session.cwd,
             "model": session.model,
-            "created_at": session.created_at.isoformat() if session.created_at else "",
+            "created_at": session.created_at,
             "message_count": session.message_count,
-            "messages": [
-                {
-                    "type": m.type,
-                    "content": m.content,
-                    "timestamp": m.timestamp.isoformat() if m.timestamp else "",
-                }
-                for m in messages
-            ],
+            "messages": messages_by_session[sid],
         })
 
-    logger.info(f"Generating PDF for {len(sessions_data)} session(s)")
-    pdf_bytes = generate_pdf(sessions_data)
-
     # Build filename
     if len(sessions_data) == 1:
         title = (sessions_data[0].get("display") or "session")[:40]
@@ -81,8 +159,31 @@ async def export_sessions_pdf(
     else:
         filename = f"sessions_export_{len(sessions_data)}.pdf"
 
-    return StreamingResponse(
-        iter([pdf_bytes]),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    logger.info(f"Generating PDF for {len(sessions_data)} session(s)")
+    # Render in a worker process into a temp file, so large exports are
+    # streamed back rather than held as one buffer. The file is unlinked once
+    # opened and removed from disk when the response closes it
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        await _render_pdf(sessions_data, pdf_path)
+        pdf_file = open(pdf_path, "rb")
+    finally:
+        os.unlink(pdf_path)
+
+    # Sync iterators are consumed in Starlette's threadpool, so disk reads
+    # of a spilled file don't block the event loop. The background task
+    # closes the file if the client disconnects before the body is read
+    try:
+        return StreamingResponse(
+            _iter_file(pdf_file),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(os.fstat(pdf_file.fileno()).st_size),
+            },
+            background=BackgroundTask(pdf_file.close),
+        )
+    except BaseException:
+        pdf_file.close()
+        raise
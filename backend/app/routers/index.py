@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, BackgroundTasks
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, write_session
 from app.models import Session
 from app.schemas import IndexStatus
 from app.services.indexer import index_all_sessions, is_indexing, get_last_indexed
@@ -23,18 +23,15 @@ async def get_index_status(
     """
     Get current indexing status and statistics.
     """
-    # Get counts
-    total_query = select(func.count()).select_from(Session)
-    claude_query = select(func.count()).select_from(Session).where(Session.source == "claude")
-    codex_query = select(func.count()).select_from(Session).where(Session.source == "codex")
-
-    total_result = await db.execute(total_query)
-    claude_result = await db.execute(claude_query)
-    codex_result = await db.execute(codex_query)
+    # Get per-source counts in a single scan
+    result = await db.execute(
+        select(Session.source, func.count()).group_by(Session.source)
+    )
+    counts = dict(result.all())
 
-    total = total_result.scalar() or 0
-    claude = claude_result.scalar() or 0
-    codex = codex_result.scalar() or 0
+    claude = counts.get("claude", 0)
+    codex = counts.get("codex", 0)
+    total = sum(counts.values())
 
     return IndexStatus(
         is_indexing=await is_indexing(),
@@ -45,11 +42,21 @@ async def get_index_status(
     )
 
 
+async def _run_index(force: bool):
+    """Background task that indexes with its own write session.
+
+    A request-scoped session is closed before background tasks run, and
+    reusing it would check out the single write connection without ever
+    returning it.
+    """
+    async with write_session() as db:
+        await index_all_sessions(db, force)
+
+
 @router.post("/refresh")
 async def refresh_index(
     background_tasks: BackgroundTasks,
     force: bool = False,
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Trigger a background re-index of all sessions.
@@ -61,6 +68,6 @@ async def refresh_index(
         return {"status": "already_running"}
 
     # Run indexing in background
-    background_tasks.add_task(index_all_sessions, db, force)
+    background_tasks.add_task(_run_index, force)
 
     return {"status": "started"}
@@ -1,41 +1,83 @@
 """Message API endpoints."""
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import Message, Session
-from app.schemas import MessageResponse
+from app.schemas import (
+    MESSAGE_LIST_ADAPTER,
+    MESSAGE_LIST_ITEM_ADAPTER,
+    MessageListItem,
+    MessageListItemDict,
+    MessageResponse,
+    MessageResponseDict,
+    orm_to_dict,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sessions", tags=["messages"])
 
 
-@router.get("/{session_id}/messages", response_model=list[MessageResponse])
+# Both shapes are returned as pre-encoded Responses, so the union is
+# documentation only and never used to validate
+@router.get(
+    "/{session_id}/messages",
+    response_model=None,
+    responses={200: {
+        "model": list[MessageResponseDict] | list[MessageListItem],
+        "description": "Full messages, or previews only when full=false",
+    }},
+)
 async def get_session_messages(
     session_id: str,
+    full: bool = Query(True, description="Include full message content; false returns previews only"),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all messages for a session, ordered by sequence.
     """
-    # Verify session exists
-    session_query = select(Session).where(Session.id == session_id)
-    session_result = await db.execute(session_query)
-    session = session_result.scalar_one_or_none()
+    # Verify session exists (without loading the row)
+    session_exists = await db.scalar(select(exists().where(Session.id == session_id)))
 
-    if not session:
+    if not session_exists:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Get messages
-    query = select(Message).where(Message.session_id == session_id).order_by(Message.sequence)
+    # Previews only: skip loading the full content column
+    if not full:
+        query = select(
+            Message.id,
+            Message.type,
+            Message.content_preview,
+            Message.timestamp,
+            Message.sequence,
+        ).where(
+            Message.session_id == session_id,
+            Message.agent_id.is_(None),
+        ).order_by(Message.sequence)
+        result = await db.execute(query)
+        return Response(
+            MESSAGE_LIST_ITEM_ADAPTER.dump_json([orm_to_dict(MessageListItemDict, row) for row in result.all()]),
+            media_type="application/json",
+        )
+
+    # Get messages (subagent messages cached under the session are served
+    # by the subagent endpoints)
+    query = select(Message).where(
+        Message.session_id == session_id,
+        Message.agent_id.is_(None),
+    ).order_by(Message.sequence)
     result = await db.execute(query)
     messages = result.scalars().all()
 
-    return [MessageResponse.model_validate(m) for m in messages]
+    # Returning a Response skips FastAPI's separate validate and encode passes
+    return Response(
+        MESSAGE_LIST_ADAPTER.dump_json([orm_to_dict(MessageResponseDict, m) for m in messages]),
+        media_type="application/json",
+    )
 
 
 @router.get("/{session_id}/messages/{message_id}", response_model=MessageResponse)
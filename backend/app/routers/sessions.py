@@ -1,21 +1,37 @@
 """Session API endpoints."""
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from math import ceil
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, text, column, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-from app.database import get_db
+from app.database import get_db, read_session
 from app.models import Session, AssociatedFile
 from app.schemas import SessionsResponse, SessionListItem, SessionDetail, AssociatedFileResponse, ProjectInfo
+from app.services.indexer import get_index_version
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+# Project list cache: (index version, monotonic expiry, projects). The
+# project set only changes when the indexer runs.
+PROJECTS_CACHE_TTL_SECONDS = 30
+_projects_cache: tuple[int, float, list[ProjectInfo]] | None = None
+_projects_cache_lock = asyncio.Lock()
+
+# Shortest search term the trigram full-text index can match; shorter terms
+# fall back to a LIKE scan
+FTS_MIN_QUERY_LENGTH = 3
+
 
 @router.get("", response_model=SessionsResponse)
 async def list_sessions(
@@ -31,19 +47,27 @@ async def list_sessions(
     """
     List sessions with filters and pagination.
     """
-    # Build query
-    query = select(Session)
+    # Collect filter predicates so the page and count queries share them
+    conds = []
 
-    # Apply filters
     if source:
-        query = query.where(Session.source == source)
+        conds.append(Session.source == source)
 
     if project:
-        query = query.where(Session.project == project)
-
-    if search:
+        conds.append(Session.project == project)
+
+    if search and len(search) >= FTS_MIN_QUERY_LENGTH:
+        # Quote as a single FTS phrase so user input isn't parsed as query syntax
+        fts_query = '"' + search.replace('"', '""') + '"'
+        fts_match = (
+            text("SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH :fts_query")
+            .bindparams(fts_query=fts_query)
+            .columns(column("rowid"))
+        )
+        conds.append(literal_column("sessions.rowid").in_(fts_match))
+    elif search:
         search_pattern = f"%{search}%"
-        query = query.where(
+        conds.append(
             or_(
                 Session.display.ilike(search_pattern),
                 Session.project.ilike(search_pattern),
@@ -52,22 +76,27 @@ async def list_sessions(
         )
 
     if date_from:
-        query = query.where(Session.created_at >= date_from)
+        conds.append(Session.created_at >= date_from)
 
     if date_to:
-        query = query.where(Session.created_at <= date_to)
+        conds.append(Session.created_at <= date_to)
+
+    query = select(Session).where(*conds)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    result = await db.execute(count_query)
-    total = result.scalar() or 0
+    # Total count (directly against the table, no subquery)
+    count_query = select(func.count()).select_from(Session).where(*conds)
 
     # Apply ordering and pagination
     query = query.order_by(Session.created_at.desc())
     query = query.offset((page - 1) * page_size).limit(page_size)
 
-    # Execute query
-    result = await db.execute(query)
+    # Run count and page queries concurrently on separate connections
+    async with read_session() as count_db:
+        count_result, result = await asyncio.gather(
+            count_db.execute(count_query),
+            db.execute(query),
+        )
+    total = count_result.scalar() or 0
     sessions = result.scalars().all()
 
     return SessionsResponse(
@@ -87,7 +116,9 @@ async def get_session(
     """
     Get detailed session information.
     """
-    query = select(Session).where(Session.id == session_id)
+    # SessionDetail serializes no relationships; make any accidental access
+    # fail loudly instead of attempting an implicit (async-unsafe) lazy load
+    query = select(Session).options(raiseload("*")).where(Session.id == session_id)
     result = await db.execute(query)
     session = result.scalar_one_or_none()
 
@@ -119,6 +150,21 @@ async def list_projects(
     """
     Get list of unique project paths with last activity date.
     """
+    global _projects_cache
+
+    async with _projects_cache_lock:
+        version = await get_index_version()
+        now = time.monotonic()
+        if _projects_cache and _projects_cache[0] == version and _projects_cache[1] > now:
+            return _projects_cache[2]
+
+        projects = await _query_projects(db)
+        _projects_cache = (version, now + PROJECTS_CACHE_TTL_SECONDS, projects)
+        return projects
+
+
+async def _query_projects(db: AsyncSession) -> list[ProjectInfo]:
+    """Query unique project paths with their last activity date."""
     query = (
         select(
             Session.project,
@@ -138,9 +184,112 @@ async def list_projects(
     ]
 
 
+# Directories to skip when collecting project files (dependencies, build
+# outputs, caches, etc.)
+PROJECT_SKIP_DIRS = {
+    "node_modules", ".venv", "venv", ".git", "vendor", "__pycache__",
+    ".tox", ".mypy_cache", ".pytest_cache", "dist", "build", ".next",
+    ".svelte-kit", ".nuxt", "target", ".cargo", "Pods", ".build",
+    ".egg-info", ".eggs", "site-packages", ".cache",
+}
+
+# Filenames to skip (common non-project docs)
+PROJECT_SKIP_FILENAMES = {"license.md", "licence.md"}
+
+# Worker threads used to read project markdown files in parallel
+PROJECT_READ_WORKERS = 8
+
+# Limits on returned markdown content, in characters: per file, and across
+# the whole response (reading stops once the total passes this)
+PROJECT_FILE_MAX_CHARS = 262_144
+PROJECT_FILES_MAX_TOTAL_CHARS = 5_242_880
+
+
+def _read_md(md_file: Path) -> str | None:
+    """Read up to one character past the per-file limit of a markdown file."""
+    try:
+        with md_file.open(encoding="utf-8") as f:
+            return f.read(PROJECT_FILE_MAX_CHARS + 1)
+    except Exception as e:
+        logger.warning(f"Failed to read {md_file}: {e}")
+        return None
+
+
+def _project_file(
+    md_file: Path,
+    relative_path: str,
+    content: str | None = None,
+    truncated: bool = False,
+) -> AssociatedFileResponse:
+    """Build the response entry for a project markdown file."""
+    return AssociatedFileResponse(
+        id=str(md_file),
+        session_id="",  # Not tied to a specific session
+        file_type=f"project_{relative_path}",
+        content=content,
+        file_path=str(md_file),
+        truncated=truncated,
+    )
+
+
+def _collect_md(project_path: Path, include_content: bool = True) -> list[AssociatedFileResponse]:
+    """Find and read markdown files in a project directory (blocking)."""
+    md_files = []
+
+    # Find all .md files recursively, pruning dependency/build directories
+    # before descending into them
+    for dirpath, dirnames, filenames in os.walk(project_path):
+        dirnames[:] = [d for d in dirnames if d not in PROJECT_SKIP_DIRS]
+
+        for filename in filenames:
+            # Skip non-markdown and licence/license files
+            if not filename.endswith(".md") or filename.lower() in PROJECT_SKIP_FILENAMES:
+                continue
+
+            md_file = Path(dirpath, filename)
+            if not md_file.is_file():
+                continue
+
+            md_files.append((md_file, str(md_file.relative_to(project_path))))
+
+    # Sort by relative path (root files first, then subdirectories) so the
+    # total size limit keeps the top-level docs
+    md_files.sort(key=lambda item: (item[1].count('/'), item[1]))
+
+    if not include_content:
+        return [_project_file(md_file, relative_path) for md_file, relative_path in md_files]
+
+    files = []
+    total_chars = 0
+
+    with ThreadPoolExecutor(max_workers=PROJECT_READ_WORKERS) as executor:
+        for start in range(0, len(md_files), PROJECT_READ_WORKERS):
+            batch = md_files[start:start + PROJECT_READ_WORKERS]
+            contents = executor.map(_read_md, [md_file for md_file, _ in batch])
+
+            for (md_file, relative_path), content in zip(batch, contents):
+                if content is None:
+                    continue
+
+                truncated = len(content) > PROJECT_FILE_MAX_CHARS
+                content = content[:PROJECT_FILE_MAX_CHARS]
+                total_chars += len(content)
+                files.append(_project_file(md_file, relative_path, content, truncated))
+
+            if total_chars >= PROJECT_FILES_MAX_TOTAL_CHARS:
+                logger.warning(
+                    f"[Project Files] Content limit reached for {project_path}, "
+                    f"returning {len(files)} of {len(md_files)} files"
+                )
+                break
+
+    return files
+
+
 @router.get("/projects/{project:path}/files", response_model=list[AssociatedFileResponse])
 async def get_project_files(
     project: str,
+    include_content: bool = Query(True, description="Include file contents; false returns paths only"),
 ):
     """
     Get markdown files from the project directory.
@@ -155,49 +304,5 @@ async def get_project_files(
         logger.warning(f"[Project Files] Path not found or not a directory: {project_path}")
         return []
 
-    files = []
-
-    # Directories to skip (dependencies, build outputs, caches, etc.)
-    skip_dirs = {
-        "node_modules", ".venv", "venv", ".git", "vendor", "__pycache__",
-        ".tox", ".mypy_cache", ".pytest_cache", "dist", "build", ".next",
-        ".svelte-kit", ".nuxt", "target", ".cargo", "Pods", ".build",
-        ".egg-info", ".eggs", "site-packages", ".cache",
-    }
-
-    # Filenames to skip (common non-project docs)
-    skip_filenames = {"license.md", "licence.md"}
-
-    # Find all .md files recursively, skipping dependency directories
-    for md_file in project_path.rglob("*.md"):
-        if not md_file.is_file():
-            continue
-
-        # Skip files inside dependency/build directories
-        if skip_dirs.intersection(md_file.relative_to(project_path).parts):
-            continue
-
-        # Skip licence/license files
-        if md_file.name.lower() in skip_filenames:
-            continue
-
-        try:
-            content = md_file.read_text(encoding="utf-8")
-            relative_path = md_file.relative_to(project_path)
-            files.append(
-                AssociatedFileResponse(
-                    id=str(md_file),
-                    session_id="",  # Not tied to a specific session
-                    file_type=f"project_{relative_path}",
-                    content=content,
-                    file_path=str(md_file),
-                )
-            )
-        except Exception as e:
-            logger.warning(f"Failed to read {md_file}: {e}")
-            continue
-
-    # Sort by relative path (root files first, then subdirectories)
-    files.sort(key=lambda f: (f.file_type.count('/'), f.file_type))
-
-    return files
+    # Walk and read on worker threads so large projects don't block the event loop
+    return await asyncio.to_thread(_collect_md, project_path, include_content)
@@ -1,22 +1,48 @@
 """Subagent API endpoints."""
-import json
 import logging
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, write_session
 from app.models import Subagent, Session, Message
-from app.schemas import SubagentResponse, MessageResponse
+from app.schemas import (
+    MESSAGE_LIST_ADAPTER,
+    SUBAGENT_LIST_ADAPTER,
+    MessageResponseDict,
+    SubagentResponseDict,
+    orm_to_dict,
+)
 from app.services.claude_parser import parse_claude_session
+from app.services.indexer import cache_subagent_messages, get_file_mtime_ns
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sessions", tags=["subagents"])
 
-
-@router.get("/{session_id}/subagents", response_model=list[SubagentResponse])
+# Statements are built once at import and bound per request, skipping
+# per-request construction and compiled-cache key generation.
+# Outer join: a single NULL row means the session exists but has no
+# subagents; no rows means the session is unknown.
+_SESSION_SUBAGENTS_QUERY = (
+    select(Subagent)
+    .select_from(Session)
+    .outerjoin(Subagent, Subagent.session_id == Session.id)
+    .where(Session.id == bindparam("session_id"))
+)
+_SUBAGENT_QUERY = select(Subagent).where(
+    Subagent.session_id == bindparam("session_id"),
+    Subagent.agent_id == bindparam("agent_id"),
+)
+_SUBAGENT_MESSAGES_QUERY = select(Message).where(
+    Message.session_id == bindparam("session_id"),
+    Message.agent_id == bindparam("agent_id"),
+).order_by(Message.sequence)
+
+
+@router.get("/{session_id}/subagents", response_model=list[SubagentResponseDict])
 async def get_session_subagents(
     session_id: str,
     db: AsyncSession = Depends(get_db),
@@ -24,23 +50,31 @@ async def get_session_subagents(
     """
     Get all subagents for a session.
     """
-    # Verify session exists
-    session_query = select(Session).where(Session.id == session_id)
-    session_result = await db.execute(session_query)
-    session = session_result.scalar_one_or_none()
+    # Fetch subagents and verify the session exists in one query
+    result = await db.execute(_SESSION_SUBAGENTS_QUERY, {"session_id": session_id})
+    rows = result.scalars().all()
 
-    if not session:
+    if not rows:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Get subagents
-    query = select(Subagent).where(Subagent.session_id == session_id)
-    result = await db.execute(query)
-    subagents = result.scalars().all()
+    subagents = [s for s in rows if s is not None]
+
+    # Returning a Response skips FastAPI's separate validate and encode passes
+    return Response(
+        SUBAGENT_LIST_ADAPTER.dump_json([orm_to_dict(SubagentResponseDict, s) for s in subagents]),
+        media_type="application/json",
+    )
 
-    return [SubagentResponse.model_validate(s) for s in subagents]
 
+def _messages_response(messages) -> Response:
+    """Serialize cached subagent messages in one pass."""
+    return Response(
+        MESSAGE_LIST_ADAPTER.dump_json([orm_to_dict(MessageResponseDict, m) for m in messages]),
+        media_type="application/json",
+    )
 
-@router.get("/{session_id}/subagents/{agent_id}/messages")
+
+@router.get("/{session_id}/subagents/{agent_id}/messages", response_model=list[MessageResponseDict])
 async def get_subagent_messages(
     session_id: str,
     agent_id: str,
@@ -50,70 +84,58 @@ async def get_subagent_messages(
     Get messages for a specific subagent.
     Lazily loads and parses the subagent file if needed.
     """
+    params = {"session_id": session_id, "agent_id": agent_id}
+
     # Get subagent record
-    query = select(Subagent).where(
-        Subagent.session_id == session_id,
-        Subagent.agent_id == agent_id,
-    )
-    result = await db.execute(query)
+    result = await db.execute(_SUBAGENT_QUERY, params)
     subagent = result.scalar_one_or_none()
 
     if not subagent:
         raise HTTPException(status_code=404, detail="Subagent not found")
 
-    # Check if we have cached messages
-    msg_query = select(Message).where(
-        Message.session_id == session_id,
-        Message.agent_id == agent_id,
-    ).order_by(Message.sequence)
-    msg_result = await db.execute(msg_query)
-    messages = msg_result.scalars().all()
+    # Cached messages are only reused while the subagent file is unchanged
+    # (or no longer on disk to re-parse)
+    file_mtime_ns = get_file_mtime_ns(subagent.file_path)
+    cache_fresh = file_mtime_ns is None or file_mtime_ns == subagent.parsed_mtime_ns
 
-    if messages:
-        return [MessageResponse.model_validate(m) for m in messages]
+    if cache_fresh:
+        # Already parsed and found empty: nothing to load or re-parse
+        if subagent.parsed_mtime_ns is not None and subagent.message_count == 0:
+            return []
 
-    # Parse subagent file if we have the path
+        msg_result = await db.execute(_SUBAGENT_MESSAGES_QUERY, params)
+        messages = msg_result.scalars().all()
+
+        if messages:
+            return _messages_response(messages)
+
+    # Parse subagent file if we have the path. Subagents found at index time
+    # are already cached; this covers files that changed since. Parsing
+    # happens before taking the single writer connection
     if subagent.file_path:
         try:
-            from pathlib import Path
             parsed = await parse_claude_session(Path(subagent.file_path))
-            if parsed is None:
-                return []
-            messages_data = parsed["messages"]
-
-            # Cache messages
-            for msg_data in messages_data:
-                message = Message(
-                    session_id=session_id,
-                    agent_id=agent_id,
-                    type=msg_data["type"],
-                    content=msg_data["content"],
-                    content_preview=msg_data.get("content_preview"),
-                    timestamp=msg_data["timestamp"],
-                    sequence=msg_data["sequence"],
-                    parent_uuid=msg_data.get("parent_uuid"),
-                    model=msg_data.get("model"),
-                    usage_input_tokens=msg_data.get("usage_input_tokens"),
-                    usage_output_tokens=msg_data.get("usage_output_tokens"),
-                )
-                db.add(message)
-
-            # Update subagent metadata
-            subagent.message_count = len(messages_data)
-            if messages_data:
-                first_msg = messages_data[0]
-                content = json.loads(first_msg["content"])
-                if "content" in content:
-                    text = content.get("content", "")[:200]
-                    subagent.first_message = text
-
-            await db.commit()
-
-            # Return cached messages
-            msg_result = await db.execute(msg_query)
-            messages = msg_result.scalars().all()
-            return [MessageResponse.model_validate(m) for m in messages]
 
+            async with write_session() as write_db:
+                result = await write_db.execute(_SUBAGENT_QUERY, params)
+                subagent = result.scalar_one_or_none()
+                if not subagent:
+                    raise HTTPException(status_code=404, detail="Subagent not found")
+
+                # Another request may have cached this file version while
+                # we waited for the writer
+                if file_mtime_ns is not None and subagent.parsed_mtime_ns == file_mtime_ns:
+                    msg_result = await write_db.execute(_SUBAGENT_MESSAGES_QUERY, params)
+                    return _messages_response(msg_result.scalars().all())
+
+                rows = await cache_subagent_messages(write_db, subagent, parsed, file_mtime_ns, replace=True)
+                await write_db.commit()
+
+            # Rows already carry every MessageResponseDict key
+            return Response(MESSAGE_LIST_ADAPTER.dump_json(rows), media_type="application/json")
+
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"[Subagents] Failed to parse subagent file {subagent.file_path}: {e}")
             raise HTTPException(status_code=500, detail="Failed to load subagent messages")
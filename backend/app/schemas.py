@@ -1,6 +1,9 @@
 """Pydantic schemas for API requests and responses."""
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Any
+
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 
 # Session schemas
@@ -88,6 +91,51 @@ class MessageResponse(MessageBase):
         from_attributes = True
 
 
+class MessageResponseDict(TypedDict):
+    """Plain-dict form of MessageResponse, for endpoints returning many rows."""
+    id: str
+    session_id: str
+    type: str
+    content: str
+    timestamp: datetime
+    sequence: int
+    parent_uuid: str | None
+    content_preview: str | None
+    agent_id: str | None
+    model: str | None
+    usage_input_tokens: int | None
+    usage_output_tokens: int | None
+
+
+# Serialize a whole list to JSON in one call, for endpoints that return
+# pre-encoded bodies
+MESSAGE_LIST_ADAPTER = TypeAdapter(list[MessageResponseDict])
+
+
+class MessageListItem(BaseModel):
+    """Schema for message list items without the full content."""
+    id: str
+    type: str
+    content_preview: str | None = None
+    timestamp: datetime
+    sequence: int
+
+    class Config:
+        from_attributes = True
+
+
+class MessageListItemDict(TypedDict):
+    """Plain-dict form of MessageListItem."""
+    id: str
+    type: str
+    content_preview: str | None
+    timestamp: datetime
+    sequence: int
+
+
+MESSAGE_LIST_ITEM_ADAPTER = TypeAdapter(list[MessageListItemDict])
+
+
 # Subagent schemas
 class SubagentBase(BaseModel):
     """Base subagent fields."""
@@ -112,6 +160,19 @@ class SubagentResponse(SubagentBase):
         from_attributes = True
 
 
+class SubagentResponseDict(TypedDict):
+    """Plain-dict form of SubagentResponse."""
+    id: str
+    session_id: str
+    agent_id: str
+    message_count: int
+    first_message: str | None
+    file_path: str | None
+
+
+SUBAGENT_LIST_ADAPTER = TypeAdapter(list[SubagentResponseDict])
+
+
 # Tool result schemas
 class ToolResultBase(BaseModel):
     """Base tool result fields."""
@@ -155,6 +216,7 @@ class AssociatedFileResponse(AssociatedFileBase):
     id: str
     session_id: str
     content: str | None = None
+    truncated: bool = False  # Content cut short by a size limit
 
     class Config:
         from_attributes = True
@@ -187,3 +249,9 @@ class IndexStatus(BaseModel):
     total_sessions: int
     claude_sessions: int
     codex_sessions: int
+
+
+# Serialization helpers
+def orm_to_dict(cls: type[Any], obj: Any) -> dict[str, Any]:
+    """Copy a TypedDict schema's keys from an ORM object or row into a plain dict."""
+    return {f: getattr(obj, f) for f in cls.__annotations__}
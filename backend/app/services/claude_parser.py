@@ -1,25 +1,38 @@
 """Parser for Claude Code JSONL session files."""
-import json
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from app.utils.jsonl import read_jsonl, create_content_preview, extract_text_from_content, strip_xml_tags, is_system_message
+import orjson
+
+from app.utils.jsonl import iter_jsonl, parse_timestamp, create_content_preview, extract_text_from_content, strip_xml_tags, is_system_message
 
 logger = logging.getLogger(__name__)
 
+# User messages that start a plan implementation aren't useful as a display title
+_PLAN_PREFIX = "Implement the following plan:"
+
 
 async def parse_claude_session(file_path: Path) -> dict[str, Any]:
     """
     Parse a Claude Code session JSONL file.
 
+    Parsing is CPU-bound, so it runs in a worker thread to keep the event
+    loop responsive.
+
     Args:
         file_path: Path to the session JSONL file
 
     Returns:
         Dictionary with session metadata and messages
     """
+    return await asyncio.to_thread(_parse_claude_session_sync, file_path)
+
+
+def _parse_claude_session_sync(file_path: Path) -> dict[str, Any]:
+    """Synchronous body of parse_claude_session."""
     messages = []
     session_meta = {
         "id": file_path.stem,
@@ -35,16 +48,10 @@ async def parse_claude_session(file_path: Path) -> dict[str, Any]:
     sequence = 0
 
     try:
-        async for entry in read_jsonl(file_path):
+        for entry in iter_jsonl(file_path):
             entry_type = entry.get("type")
             timestamp_str = entry.get("timestamp")
-            timestamp = None
-
-            if timestamp_str:
-                try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    timestamp = datetime.utcnow()
+            timestamp = parse_timestamp(timestamp_str) if timestamp_str else None
 
             # Update session metadata
             if not session_meta["created_at"] and timestamp:
@@ -59,18 +66,19 @@ async def parse_claude_session(file_path: Path) -> dict[str, Any]:
             # bash_progress, etc. with no conversation content)
             if entry_type == "user":
                 message_content = entry.get("message", {})
-                content_json = json.dumps(message_content)
+                content_json = orjson.dumps(message_content).decode()
 
-                # Extract first user message for display
+                # Extract first user message for display. The prefix check
+                # is cheap, so system messages skip the tag-stripping regex
                 if not first_user_message:
                     text = extract_text_from_content(message_content)
-                    cleaned = strip_xml_tags(text)
-                    # Skip plan content and system messages
-                    if (cleaned
-                            and not cleaned.startswith("Implement the following plan:")
-                            and not is_system_message(text)):
-                        first_user_message = cleaned[:200]
+                    if not is_system_message(text):
+                        cleaned = strip_xml_tags(text)
+                        # Skip plan content
+                        if cleaned and not cleaned.startswith(_PLAN_PREFIX):
+                            first_user_message = cleaned[:200]
 
+                # Same keys as assistant messages so rows insert uniformly
                 messages.append({
                     "type": "user",
                     "content": content_json,
@@ -79,12 +87,15 @@ async def parse_claude_session(file_path: Path) -> dict[str, Any]:
                     "sequence": sequence,
                     "uuid": entry.get("uuid"),
                     "parent_uuid": entry.get("parentUuid"),
+                    "model": None,
+                    "usage_input_tokens": None,
+                    "usage_output_tokens": None,
                 })
                 sequence += 1
 
             elif entry_type == "assistant":
                 message_content = entry.get("message", {})
-                content_json = json.dumps(message_content)
+                content_json = orjson.dumps(message_content).decode()
 
                 # Extract model info
                 if not session_meta["model"] and "model" in message_content:
@@ -124,6 +135,7 @@ async def parse_claude_session(file_path: Path) -> dict[str, Any]:
     return {
         "session": session_meta,
         "messages": messages,
+        "first_message_preview": first_user_message,
     }
 
 
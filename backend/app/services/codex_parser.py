@@ -1,11 +1,13 @@
 """Parser for Codex JSONL session files."""
-import json
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from app.utils.jsonl import read_jsonl, create_content_preview, extract_text_from_content, strip_xml_tags, is_system_message
+import orjson
+
+from app.utils.jsonl import iter_jsonl, parse_timestamp, create_content_preview, extract_text_from_content, strip_xml_tags, is_system_message
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +16,20 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
     """
     Parse a Codex session JSONL file.
 
+    Parsing is CPU-bound, so it runs in a worker thread to keep the event
+    loop responsive.
+
     Args:
         file_path: Path to the session JSONL file
 
     Returns:
         Dictionary with session metadata and messages
     """
+    return await asyncio.to_thread(_parse_codex_session_sync, file_path)
+
+
+def _parse_codex_session_sync(file_path: Path) -> dict[str, Any]:
+    """Synchronous body of parse_codex_session."""
     messages = []
     session_meta = {
         "id": None,
@@ -35,17 +45,11 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
     sequence = 0
 
     try:
-        async for entry in read_jsonl(file_path):
+        for entry in iter_jsonl(file_path):
             entry_type = entry.get("type")
             timestamp_str = entry.get("timestamp")
             payload = entry.get("payload", {})
-            timestamp = None
-
-            if timestamp_str:
-                try:
-                    timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                except (ValueError, AttributeError):
-                    timestamp = datetime.utcnow()
+            timestamp = parse_timestamp(timestamp_str) if timestamp_str else None
 
             # Parse session metadata
             if entry_type == "session_meta":
@@ -67,7 +71,7 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
 
                 if message_type == "message" and role in ("user", "assistant"):
                     content_list = payload.get("content", [])
-                    content_json = json.dumps(payload)
+                    content_json = orjson.dumps(payload).decode()
 
                     # Extract text for display
                     text = ""
@@ -78,9 +82,9 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
                                 text += item.get("text", "")
 
                     # Capture first user message
-                    if role == "user" and not first_user_message and text.strip():
+                    if role == "user" and not first_user_message and text.strip() and not is_system_message(text):
                         cleaned = strip_xml_tags(text)
-                        if cleaned and not is_system_message(text):
+                        if cleaned:
                             first_user_message = cleaned[:200]
 
                     messages.append({
@@ -95,7 +99,7 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
                     sequence += 1
 
                 elif message_type == "function_call":
-                    content_json = json.dumps(payload)
+                    content_json = orjson.dumps(payload).decode()
                     messages.append({
                         "type": "assistant",
                         "content": content_json,
@@ -108,7 +112,7 @@ async def parse_codex_session(file_path: Path) -> dict[str, Any]:
                     sequence += 1
 
                 elif message_type == "function_call_output":
-                    content_json = json.dumps(payload)
+                    content_json = orjson.dumps(payload).decode()
                     messages.append({
                         "type": "tool_result",
                         "content": content_json,
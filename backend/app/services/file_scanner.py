@@ -1,10 +1,37 @@
 """File system scanning for session files."""
 import logging
+import os
 from pathlib import Path
 from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
+# Document types picked up as session artifacts
+_ARTIFACT_EXTS = frozenset({".md", ".txt", ".log", ".json"})
+
+# Session subdirectories searched recursively for artifacts
+_ARTIFACT_SUBDIRS = ("output", "artifacts", "docs")
+
+
+def _iter_jsonl_files(directory: str) -> Iterator[Path]:
+    """Yield the .jsonl files directly inside a directory.
+
+    Uses os.scandir so file-type checks come from the cached directory
+    entry instead of a stat per path.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".jsonl") and entry.is_file():
+                yield Path(entry.path)
+
+
+def _iter_digit_dirs(directory: str) -> Iterator[str]:
+    """Yield paths of subdirectories with all-digit names (YYYY, MM, DD)."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.isdigit() and entry.is_dir():
+                yield entry.path
+
 
 def scan_claude_sessions(claude_dir: Path) -> Iterator[Path]:
     """
@@ -25,18 +52,16 @@ def scan_claude_sessions(claude_dir: Path) -> Iterator[Path]:
     logger.info(f"[Scanner] Scanning Claude sessions in {projects_dir}")
 
     # Find all .jsonl files in projects/*/
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
+    with os.scandir(projects_dir) as entries:
+        project_dirs = [entry.path for entry in entries if entry.is_dir()]
 
+    for project_dir in project_dirs:
         # Skip special directories
-        if project_dir.name.startswith("."):
+        if os.path.basename(project_dir).startswith("."):
             continue
 
         # Find session files (exclude subagents and tool-results subdirs)
-        for jsonl_file in project_dir.glob("*.jsonl"):
-            if jsonl_file.is_file():
-                yield jsonl_file
+        yield from _iter_jsonl_files(project_dir)
 
 
 def scan_codex_sessions(codex_dir: Path) -> Iterator[Path]:
@@ -58,27 +83,17 @@ def scan_codex_sessions(codex_dir: Path) -> Iterator[Path]:
     logger.info(f"[Scanner] Scanning Codex sessions in {sessions_dir}")
 
     # Find all .jsonl files in sessions/YYYY/MM/DD/
-    for year_dir in sessions_dir.iterdir():
-        if not year_dir.is_dir() or not year_dir.name.isdigit():
-            continue
-
-        for month_dir in year_dir.iterdir():
-            if not month_dir.is_dir() or not month_dir.name.isdigit():
-                continue
-
-            for day_dir in month_dir.iterdir():
-                if not day_dir.is_dir() or not day_dir.name.isdigit():
-                    continue
-
+    for year_dir in _iter_digit_dirs(sessions_dir):
+        for month_dir in _iter_digit_dirs(year_dir):
+            for day_dir in _iter_digit_dirs(month_dir):
                 # Find session files
-                for jsonl_file in day_dir.glob("*.jsonl"):
-                    if jsonl_file.is_file():
-                        yield jsonl_file
+                yield from _iter_jsonl_files(day_dir)
 
 
 def find_associated_files(
     session_id: str,
     claude_dir: Path,
+    project_dir: Path | None = None,
 ) -> dict[str, Path]:
     """
     Find associated files for a session (TODO, plan, debug logs, artifacts).
@@ -86,6 +101,8 @@ def find_associated_files(
     Args:
         session_id: Session UUID
         claude_dir: Path to ~/.claude directory
+        project_dir: Project directory holding the session, if known; skips
+            searching every project for the session directory
 
     Returns:
         Dictionary with file types/names and paths
@@ -108,39 +125,41 @@ def find_associated_files(
         files["debug"] = debug_path
 
     # Find session directory and scan for markdown/text artifacts
-    # Session could be in any project directory
+    # Unless given, the session could be in any project directory
     projects_dir = claude_dir / "projects"
-    if projects_dir.exists():
-        for project_dir in projects_dir.iterdir():
-            if not project_dir.is_dir():
-                continue
-
-            session_dir = project_dir / session_id
-            if session_dir.exists() and session_dir.is_dir():
-                # Find markdown and text files in session directory
-                for file_path in session_dir.iterdir():
-                    if not file_path.is_file():
-                        continue
+    if project_dir is not None:
+        project_dirs = [str(project_dir)]
+    elif projects_dir.exists():
+        with os.scandir(projects_dir) as entries:
+            project_dirs = [entry.path for entry in entries if entry.is_dir()]
+    else:
+        project_dirs = []
+
+    for project_path in project_dirs:
+        # One stat per project instead of exists() + is_dir()
+        session_dir = os.path.join(project_path, session_id)
+        if not os.path.isdir(session_dir):
+            continue
 
-                    # Skip the main session file
-                    if file_path.suffix == ".jsonl" and file_path.stem == session_id:
+        # Find markdown and text files in session directory (this also
+        # skips the main session .jsonl file)
+        with os.scandir(session_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1] in _ARTIFACT_EXTS and entry.is_file():
+                    # Use filename as key for artifacts
+                    files[f"artifact_{entry.name}"] = Path(entry.path)
+
+        # Also check subdirectories for interesting files
+        for subdir in _ARTIFACT_SUBDIRS:
+            subdir_path = os.path.join(session_dir, subdir)
+            for dirpath, _dirnames, filenames in os.walk(subdir_path):
+                for filename in filenames:
+                    if os.path.splitext(filename)[1] not in _ARTIFACT_EXTS:
                         continue
-
-                    # Include markdown, text, and other common document types
-                    if file_path.suffix in [".md", ".txt", ".log", ".json"]:
-                        # Use filename as key for artifacts
-                        file_key = f"artifact_{file_path.name}"
-                        files[file_key] = file_path
-
-                # Also check subdirectories for interesting files
-                for subdir in ["output", "artifacts", "docs"]:
-                    subdir_path = session_dir / subdir
-                    if subdir_path.exists() and subdir_path.is_dir():
-                        for file_path in subdir_path.rglob("*"):
-                            if file_path.is_file() and file_path.suffix in [".md", ".txt", ".log", ".json"]:
-                                # Include subdirectory in key
-                                rel_path = file_path.relative_to(session_dir)
-                                file_key = f"artifact_{rel_path.as_posix().replace('/', '_')}"
-                                files[file_key] = file_path
+                    file_path = os.path.join(dirpath, filename)
+                    # Include subdirectory in key
+                    rel_path = os.path.relpath(file_path, session_dir)
+                    file_key = f"artifact_{rel_path.replace(os.sep, '_')}"
+                    files[file_key] = Path(file_path)
 
     return files
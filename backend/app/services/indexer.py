@@ -1,14 +1,17 @@
 """Main indexing orchestration service."""
 import asyncio
 import logging
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, delete, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.models import Session, Message, Subagent, AssociatedFile
+from app.models import Session, Message, Subagent, AssociatedFile, generate_uuid
 from app.services.claude_parser import parse_claude_session, find_claude_subagents
 from app.services.codex_parser import parse_codex_session
 from app.services.file_scanner import scan_claude_sessions, scan_codex_sessions, find_associated_files
@@ -19,6 +22,33 @@ logger = logging.getLogger(__name__)
 # Global indexing state
 _is_indexing = False
 _last_indexed: datetime | None = None
+_index_version = 0  # Bumped after every indexing run so caches can invalidate
+
+# File paths checked per query when looking up already-indexed sessions;
+# stays well under SQLite's bound-parameter limit
+INDEXED_PATHS_BATCH_SIZE = 500
+
+# Sessions written per commit; each session gets its own savepoint so a
+# failure only rolls back that session
+INDEX_COMMIT_BATCH_SIZE = 50
+
+# Session files parsed concurrently while earlier results are written
+PARSE_CONCURRENCY = 16
+
+# Associated file content stored per file, in characters; larger files
+# (e.g. long debug logs) are stored truncated
+ASSOCIATED_FILE_MAX_CHARS = 1_048_576
+
+# Insert and delete statements, built once at import and bound per call.
+# Inserts target the Core tables: rows are plain dicts, so the ORM's bulk
+# insert bookkeeping would only add per-row overhead
+_INSERT_MESSAGE = Message.__table__.insert()
+_INSERT_ASSOCIATED_FILE = AssociatedFile.__table__.insert()
+_DELETE_SESSION_BY_PATH = delete(Session).where(Session.file_path == bindparam("file_path"))
+_DELETE_AGENT_MESSAGES = delete(Message).where(
+    Message.session_id == bindparam("session_id"),
+    Message.agent_id == bindparam("agent_id"),
+)
 
 
 async def is_indexing() -> bool:
@@ -31,6 +61,130 @@ async def get_last_indexed() -> datetime | None:
     return _last_indexed
 
 
+async def get_index_version() -> int:
+    """Get a token that changes whenever an indexing run finishes."""
+    return _index_version
+
+
+def get_file_mtime_ns(file_path: str | None) -> int | None:
+    """Return a file's mtime in nanoseconds, or None if it has no path or is missing."""
+    if not file_path:
+        return None
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+async def cache_subagent_messages(
+    db: AsyncSession,
+    subagent: Subagent,
+    parsed: dict | None,
+    file_mtime_ns: int | None,
+    replace: bool = False,
+) -> list[dict]:
+    """
+    Cache a parsed subagent file's messages, count and first message.
+
+    The caller commits.
+
+    Args:
+        db: Database session
+        subagent: Subagent record
+        parsed: Result of parse_claude_session for the subagent's file
+        file_mtime_ns: mtime of the file, taken before parsing
+        replace: If True, first delete messages cached from an older version of the file
+
+    Returns:
+        The inserted message rows
+    """
+    if replace:
+        await db.execute(
+            _DELETE_AGENT_MESSAGES,
+            {"session_id": subagent.session_id, "agent_id": subagent.agent_id},
+        )
+    subagent.parsed_mtime_ns = file_mtime_ns
+
+    if parsed is None:
+        subagent.message_count = 0
+        return []
+    messages_data = parsed["messages"]
+
+    # Turn the parser's message dicts into insert rows in place rather than
+    # copying each one. Ids are generated here so callers can return the rows
+    # without reloading them
+    rows = messages_data
+    for row in rows:
+        row["id"] = generate_uuid()
+        row["session_id"] = subagent.session_id
+        row["agent_id"] = subagent.agent_id
+        # Naive, as SQLite stores it, so cold and cached responses match
+        row["timestamp"] = row["timestamp"].replace(tzinfo=None)
+    if rows:
+        await db.execute(_INSERT_MESSAGE, rows)
+
+    # Update subagent metadata
+    subagent.message_count = len(messages_data)
+    subagent.first_message = parsed["first_message_preview"]
+
+    return rows
+
+
+def _read_associated_file(file_path: Path) -> str:
+    """Read up to one character past the stored limit of an associated file."""
+    with file_path.open(encoding="utf-8") as f:
+        return f.read(ASSOCIATED_FILE_MAX_CHARS + 1)
+
+
+async def _get_indexed_file_mtimes(db: AsyncSession, file_paths: list[str]) -> dict[str, int | None]:
+    """Return the stored file mtime of each given path that already has a session row."""
+    indexed = {}
+    for i in range(0, len(file_paths), INDEXED_PATHS_BATCH_SIZE):
+        batch = file_paths[i:i + INDEXED_PATHS_BATCH_SIZE]
+        result = await db.execute(
+            select(Session.file_path, Session.file_mtime_ns).where(Session.file_path.in_(batch))
+        )
+        indexed.update(result.tuples().all())
+    return indexed
+
+
+async def _select_files_to_index(
+    db: AsyncSession, file_paths: list[Path], force: bool
+) -> tuple[dict[Path, int | None], dict[str, int | None]]:
+    """
+    Pick the scanned files that need parsing.
+
+    New files and files whose mtime differs from the one stored at index
+    time are picked; with force, every file is. Returns the picked files
+    mapped to their current mtime, and the already-indexed paths (whose
+    rows are replaced when re-indexed).
+    """
+    # Look up already-indexed files in batches instead of one query per file
+    indexed = await _get_indexed_file_mtimes(db, [str(file_path) for file_path in file_paths])
+
+    to_index = {}
+    for file_path in file_paths:
+        path_str = str(file_path)
+        file_mtime_ns = get_file_mtime_ns(path_str)
+        if force or path_str not in indexed or indexed[path_str] != file_mtime_ns:
+            to_index[file_path] = file_mtime_ns
+    return to_index, indexed
+
+
+async def _insert_session_messages(db: AsyncSession, session_id: str, messages_data: list[dict]):
+    """
+    Bulk insert a session's parsed messages in one executemany.
+
+    The parser's message dicts are used as rows in place; ids come from the
+    column default.
+    """
+    if not messages_data:
+        return
+    for msg_data in messages_data:
+        msg_data["session_id"] = session_id
+    await db.execute(_INSERT_MESSAGE, messages_data)
+
+
 async def index_all_sessions(db: AsyncSession, force: bool = False) -> dict[str, int]:
     """
     Index all sessions from Claude and Codex directories.
@@ -42,7 +196,7 @@ async def index_all_sessions(db: AsyncSession, force: bool = False) -> dict[str,
     Returns:
         Dictionary with counts
     """
-    global _is_indexing, _last_indexed
+    global _is_indexing, _last_indexed, _index_version
 
     if _is_indexing:
         logger.warning("[Indexer] Indexing already in progress")
@@ -95,6 +249,43 @@ async def index_all_sessions(db: AsyncSession, force: bool = False) -> dict[str,
 
     finally:
         _is_indexing = False
+        _index_version += 1
+
+
+async def _parse_concurrently(
+    file_paths: list[Path],
+    parse: Callable[[Path], Awaitable[dict | None]],
+) -> AsyncIterator[tuple[Path, dict | None | BaseException]]:
+    """Parse files concurrently, yielding (path, result) as each one finishes.
+
+    At most PARSE_CONCURRENCY parses are in flight, so parsed sessions can't
+    pile up in memory faster than the caller writes them. A parse error is
+    yielded in place of the result.
+    """
+    paths = iter(file_paths)
+    in_flight: dict[asyncio.Task, Path] = {}
+
+    def start_next() -> None:
+        path = next(paths, None)
+        if path is not None:
+            in_flight[asyncio.create_task(parse(path))] = path
+
+    for _ in range(PARSE_CONCURRENCY):
+        start_next()
+
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                path = in_flight.pop(task)
+                start_next()
+                yield path, task.exception() or task.result()
+    finally:
+        # Reached when the caller stops early too (see aclosing at the call
+        # sites): don't leave parses running, or their results held, behind it
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
 
 
 async def _index_claude_sessions(db: AsyncSession, force: bool) -> tuple[int, int, int]:
@@ -102,107 +293,123 @@ async def _index_claude_sessions(db: AsyncSession, force: bool) -> tuple[int, in
     session_count = 0
     message_count = 0
     error_count = 0
+    pending = 0  # Sessions written since the last commit
 
-    for file_path in scan_claude_sessions(settings.claude_dir):
-        try:
-            # Check if already indexed
-            if not force:
-                result = await db.execute(
-                    select(Session).where(Session.file_path == str(file_path))
-                )
-                if result.scalar_one_or_none():
-                    continue
+    file_paths = list(scan_claude_sessions(settings.claude_dir))
 
-            # Parse session
-            parsed = await parse_claude_session(file_path)
-
-            # Skip empty sessions (only file-history-snapshot entries)
-            if parsed is None:
-                continue
-
-            session_data = parsed["session"]
-            messages_data = parsed["messages"]
-
-            # Get project from path, preferring cwd from session data
-            project = get_project_from_path(file_path, cwd=session_data.get("cwd"))
-            if project:
-                session_data["project"] = project
-
-            # Create session record
-            session = Session(
-                id=session_data["id"],
-                source=session_data["source"],
-                project=session_data.get("project"),
-                cwd=session_data.get("cwd"),
-                model=session_data.get("model"),
-                display=session_data.get("display"),
-                created_at=session_data["created_at"] or datetime.utcnow(),
-                updated_at=session_data["updated_at"] or datetime.utcnow(),
-                message_count=session_data["message_count"],
-                subagent_count=0,
-                has_tool_results=False,
-                file_path=session_data["file_path"],
-            )
-
-            db.add(session)
-
-            # Batch insert messages
-            for msg_data in messages_data:
-                message = Message(
-                    session_id=session.id,
-                    type=msg_data["type"],
-                    content=msg_data["content"],
-                    content_preview=msg_data.get("content_preview"),
-                    timestamp=msg_data["timestamp"],
-                    sequence=msg_data["sequence"],
-                    parent_uuid=msg_data.get("parent_uuid"),
-                    model=msg_data.get("model"),
-                    usage_input_tokens=msg_data.get("usage_input_tokens"),
-                    usage_output_tokens=msg_data.get("usage_output_tokens"),
-                )
-                db.add(message)
-
-            # Find and index subagents
-            project_dir = file_path.parent
-            subagent_files = await find_claude_subagents(session.id, project_dir)
-            for subagent_file in subagent_files:
-                agent_id = subagent_file.stem
-                subagent = Subagent(
-                    session_id=session.id,
-                    agent_id=agent_id,
-                    file_path=str(subagent_file),
-                )
-                db.add(subagent)
-                session.subagent_count += 1
-
-            # Find and index associated files
-            assoc_files = find_associated_files(session.id, settings.claude_dir)
-            for file_type, file_path_obj in assoc_files.items():
-                if file_path_obj and file_path_obj.exists():
-                    try:
-                        content = file_path_obj.read_text(encoding="utf-8")
-                        assoc_file = AssociatedFile(
-                            session_id=session.id,
-                            file_type=file_type,
-                            content=content,
-                            file_path=str(file_path_obj),
-                        )
-                        db.add(assoc_file)
-                    except Exception as e:
-                        logger.warning(f"[Indexer] Failed to read {file_path_obj}: {e}")
+    # Unchanged files are skipped before parsing
+    to_index, indexed = await _select_files_to_index(db, file_paths, force)
 
-            await db.commit()
+    # Parsing runs ahead in worker threads; writes stay serial on this session
+    async with aclosing(_parse_concurrently(list(to_index), parse_claude_session)) as results:
+        async for file_path, parsed in results:
+            try:
+                if isinstance(parsed, BaseException):
+                    raise parsed
 
-            session_count += 1
-            message_count += len(messages_data)
+                # Skip empty sessions (only file-history-snapshot entries)
+                if parsed is None:
+                    continue
 
-            if session_count % 10 == 0:
-                logger.info(f"[Indexer] Indexed {session_count} Claude sessions...")
+                session_data = parsed["session"]
+                messages_data = parsed["messages"]
+
+                # Get project from path, preferring cwd from session data
+                project = get_project_from_path(file_path, cwd=session_data.get("cwd"))
+                if project:
+                    session_data["project"] = project
+
+                # Create session record
+                session = Session(
+                    id=session_data["id"],
+                    source=session_data["source"],
+                    project=session_data.get("project"),
+                    cwd=session_data.get("cwd"),
+                    model=session_data.get("model"),
+                    display=session_data.get("display"),
+                    created_at=session_data["created_at"] or datetime.utcnow(),
+                    updated_at=session_data["updated_at"] or datetime.utcnow(),
+                    message_count=session_data["message_count"],
+                    subagent_count=0,
+                    has_tool_results=False,
+                    file_path=session_data["file_path"],
+                    file_mtime_ns=to_index[file_path],
+                )
 
-        except Exception as e:
-            logger.error(f"[Indexer] Failed to index Claude session {file_path}: {type(e).__name__}: {e}")
-            error_count += 1
-            await db.rollback()
+                # Savepoint per session: a failure rolls back only this session,
+                # while commits are batched
+                async with db.begin_nested():
+                    # Replace the previous index of a changed file; its messages,
+                    # subagents and files go with it through ON DELETE CASCADE
+                    if str(file_path) in indexed:
+                        await db.execute(_DELETE_SESSION_BY_PATH, {"file_path": str(file_path)})
+
+                    db.add(session)
+                    # Core inserts don't autoflush; the session row must exist
+                    # before its messages reference it
+                    await db.flush()
+
+                    # Bulk insert messages, using the parser's dicts as rows
+                    await _insert_session_messages(db, session.id, messages_data)
+
+                    # Find and index subagents
+                    project_dir = file_path.parent
+                    subagent_files = await find_claude_subagents(session.id, project_dir)
+                    for subagent_file in subagent_files:
+                        agent_id = subagent_file.stem
+                        subagent = Subagent(
+                            session_id=session.id,
+                            agent_id=agent_id,
+                            file_path=str(subagent_file),
+                        )
+                        db.add(subagent)
+                        session.subagent_count += 1
+
+                        # Cache messages now so the first view doesn't parse on the
+                        # request path; on failure the endpoint parses lazily instead
+                        file_mtime_ns = get_file_mtime_ns(str(subagent_file))
+                        try:
+                            parsed_subagent = await parse_claude_session(subagent_file)
+                        except Exception as e:
+                            logger.warning(f"[Indexer] Failed to parse subagent {subagent_file}: {e}")
+                            continue
+                        await cache_subagent_messages(db, subagent, parsed_subagent, file_mtime_ns)
+
+                    # Find and index associated files
+                    assoc_files = find_associated_files(session.id, settings.claude_dir, project_dir)
+                    assoc_rows = []
+                    for file_type, file_path_obj in assoc_files.items():
+                        if file_path_obj and file_path_obj.exists():
+                            try:
+                                content = _read_associated_file(file_path_obj)
+                                assoc_rows.append({
+                                    "session_id": session.id,
+                                    "file_type": file_type,
+                                    "content": content[:ASSOCIATED_FILE_MAX_CHARS],
+                                    "truncated": len(content) > ASSOCIATED_FILE_MAX_CHARS,
+                                    "file_path": str(file_path_obj),
+                                })
+                            except Exception as e:
+                                logger.warning(f"[Indexer] Failed to read {file_path_obj}: {e}")
+                    if assoc_rows:
+                        await db.execute(_INSERT_ASSOCIATED_FILE, assoc_rows)
+
+                session_count += 1
+                message_count += len(messages_data)
+                pending += 1
+
+                if session_count % 10 == 0:
+                    logger.info(f"[Indexer] Indexed {session_count} Claude sessions...")
+
+            except Exception as e:
+                logger.error(f"[Indexer] Failed to index Claude session {file_path}: {type(e).__name__}: {e}")
+                error_count += 1
+
+            if pending >= INDEX_COMMIT_BATCH_SIZE:
+                await db.commit()
+                pending = 0
+
+    await db.commit()
 
     return session_count, message_count, error_count
 
@@ -212,71 +419,77 @@ async def _index_codex_sessions(db: AsyncSession, force: bool) -> tuple[int, int
     session_count = 0
     message_count = 0
     error_count = 0
+    pending = 0  # Sessions written since the last commit
 
-    for file_path in scan_codex_sessions(settings.codex_dir):
-        try:
-            # Check if already indexed
-            if not force:
-                result = await db.execute(
-                    select(Session).where(Session.file_path == str(file_path))
-                )
-                if result.scalar_one_or_none():
+    file_paths = list(scan_codex_sessions(settings.codex_dir))
+
+    # Unchanged files are skipped before parsing
+    to_index, indexed = await _select_files_to_index(db, file_paths, force)
+
+    # Parsing runs ahead in worker threads; writes stay serial on this session
+    async with aclosing(_parse_concurrently(list(to_index), parse_codex_session)) as results:
+        async for file_path, parsed in results:
+            try:
+                if isinstance(parsed, BaseException):
+                    raise parsed
+
+                if parsed is None:
                     continue
 
-            # Parse session
-            parsed = await parse_codex_session(file_path)
-
-            if parsed is None:
-                continue
-
-            session_data = parsed["session"]
-            messages_data = parsed["messages"]
-
-            # Use filename stem as session ID for Codex (to ensure uniqueness)
-            session_id = file_path.stem
-
-            # Create session record
-            session = Session(
-                id=session_id,
-                source=session_data["source"],
-                project=session_data.get("project"),
-                cwd=session_data.get("cwd"),
-                model=session_data.get("model"),
-                display=session_data.get("display"),
-                created_at=session_data["created_at"] or datetime.utcnow(),
-                updated_at=session_data["updated_at"] or datetime.utcnow(),
-                message_count=session_data["message_count"],
-                subagent_count=0,
-                has_tool_results=False,
-                file_path=session_data["file_path"],
-            )
-
-            db.add(session)
-
-            # Batch insert messages
-            for msg_data in messages_data:
-                message = Message(
-                    session_id=session_id,
-                    type=msg_data["type"],
-                    content=msg_data["content"],
-                    content_preview=msg_data.get("content_preview"),
-                    timestamp=msg_data["timestamp"],
-                    sequence=msg_data["sequence"],
-                    parent_uuid=msg_data.get("parent_uuid"),
+                session_data = parsed["session"]
+                messages_data = parsed["messages"]
+
+                # Use filename stem as session ID for Codex (to ensure uniqueness)
+                session_id = file_path.stem
+
+                # Create session record
+                session = Session(
+                    id=session_id,
+                    source=session_data["source"],
+                    project=session_data.get("project"),
+                    cwd=session_data.get("cwd"),
+                    model=session_data.get("model"),
+                    display=session_data.get("display"),
+                    created_at=session_data["created_at"] or datetime.utcnow(),
+                    updated_at=session_data["updated_at"] or datetime.utcnow(),
+                    message_count=session_data["message_count"],
+                    subagent_count=0,
+                    has_tool_results=False,
+                    file_path=session_data["file_path"],
+                    file_mtime_ns=to_index[file_path],
                 )
-                db.add(message)
 
-            await db.commit()
+                # Savepoint per session: a failure rolls back only this session,
+                # while commits are batched
+                async with db.begin_nested():
+                    # Replace the previous index of a changed file; its messages,
+                    # subagents and files go with it through ON DELETE CASCADE
+                    if str(file_path) in indexed:
+                        await db.execute(_DELETE_SESSION_BY_PATH, {"file_path": str(file_path)})
+
+                    db.add(session)
+                    # Core inserts don't autoflush; the session row must exist
+                    # before its messages reference it
+                    await db.flush()
+
+                    # Bulk insert messages, using the parser's dicts as rows
+                    await _insert_session_messages(db, session_id, messages_data)
+
+                session_count += 1
+                message_count += len(messages_data)
+                pending += 1
+
+                if session_count % 10 == 0:
+                    logger.info(f"[Indexer] Indexed {session_count} Codex sessions...")
 
-            session_count += 1
-            message_count += len(messages_data)
+            except Exception as e:
+                logger.error(f"[Indexer] Failed to index Codex session {file_path}: {type(e).__name__}: {e}")
+                error_count += 1
 
-            if session_count % 10 == 0:
-                logger.info(f"[Indexer] Indexed {session_count} Codex sessions...")
+            if pending >= INDEX_COMMIT_BATCH_SIZE:
+                await db.commit()
+                pending = 0
 
-        except Exception as e:
-            logger.error(f"[Indexer] Failed to index Codex session {file_path}: {type(e).__name__}: {e}")
-            error_count += 1
-            await db.rollback()
+    await db.commit()
 
     return session_count, message_count, error_count
@@ -1,10 +1,16 @@
 """PDF export service — renders sessions as HTML then converts to PDF via WeasyPrint."""
 
-import json
+import functools
+import html
 import logging
+import tempfile
+import threading
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from typing import BinaryIO
 
 import markdown
+import orjson
 from jinja2 import Template
 from weasyprint import HTML
 
@@ -14,6 +20,11 @@ logger = logging.getLogger(__name__)
 # Content block parsing (mirrors frontend parseContentBlocks)
 # ---------------------------------------------------------------------------
 
+def _pretty_json(value) -> str:
+    """Serialize a value as indented JSON for display."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
 def parse_content_blocks(content_str: str) -> list[dict]:
     """Parse a message content JSON string into typed content blocks."""
     if not content_str:
@@ -21,8 +32,8 @@ def parse_content_blocks(content_str: str) -> list[dict]:
 
     # Try parsing as JSON
     try:
-        content = json.loads(content_str)
-    except (json.JSONDecodeError, TypeError):
+        content = orjson.loads(content_str)
+    except (orjson.JSONDecodeError, TypeError):
         text = str(content_str).strip()
         return [{"type": "text", "text": text}] if text else []
 
@@ -50,7 +61,7 @@ def parse_content_blocks(content_str: str) -> list[dict]:
         if content.get("type") == "function_call":
             args = content.get("arguments", "")
             if not isinstance(args, str):
-                args = json.dumps(args, indent=2)
+                args = _pretty_json(args)
             blocks.append({
                 "type": "function_call",
                 "name": content.get("name") or content.get("call_id") or "function",
@@ -62,14 +73,14 @@ def parse_content_blocks(content_str: str) -> list[dict]:
         if content.get("type") == "function_call_output":
             blocks.append({
                 "type": "function_call_output",
-                "output": content.get("output") or json.dumps(content, indent=2),
+                "output": content.get("output") or _pretty_json(content),
             })
             return blocks
     elif isinstance(content, list):
         items = content
 
     if not items and not blocks:
-        s = json.dumps(content, indent=2)
+        s = _pretty_json(content)
         if s not in ("{}", "[]"):
             blocks.append({"type": "unknown", "text": s})
         return blocks
@@ -100,7 +111,7 @@ def parse_content_blocks(content_str: str) -> list[dict]:
         elif item_type == "tool_use":
             inp = item.get("input", "")
             if not isinstance(inp, str):
-                inp = json.dumps(inp, indent=2)
+                inp = _pretty_json(inp)
             blocks.append({
                 "type": "tool_use",
                 "name": item.get("name") or "tool",
@@ -113,11 +124,11 @@ def parse_content_blocks(content_str: str) -> list[dict]:
                 output = c
             elif isinstance(c, list):
                 output = "\n".join(
-                    x.get("text", json.dumps(x)) if isinstance(x, dict) else str(x)
+                    x.get("text", orjson.dumps(x).decode()) if isinstance(x, dict) else str(x)
                     for x in c
                 )
             else:
-                output = json.dumps(c, indent=2)
+                output = _pretty_json(c)
             blocks.append({"type": "tool_result", "output": output})
 
         else:
@@ -132,27 +143,52 @@ def parse_content_blocks(content_str: str) -> list[dict]:
 # Markdown rendering
 # ---------------------------------------------------------------------------
 
-_md = markdown.Markdown(extensions=["fenced_code", "tables", "nl2br"])
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "nl2br"]
+
+# A Markdown instance keeps per-document state between reset() and
+# convert(), so each thread rendering a PDF gets its own
+_md_local = threading.local()
+
+# Short texts repeat a lot across sessions ("OK", acknowledgements, repeated
+# tool output), so their HTML is cached; longer texts always re-render to
+# keep the cache small
+RENDER_MD_CACHE_SIZE = 4096
+RENDER_MD_CACHE_MAX_LEN = 8192
+
+
+def _convert_md(text: str) -> str:
+    md = getattr(_md_local, "md", None)
+    if md is None:
+        md = _md_local.md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    md.reset()
+    return md.convert(text)
+
+
+_convert_md_cached = functools.lru_cache(maxsize=RENDER_MD_CACHE_SIZE)(_convert_md)
 
 
 def render_md(text: str) -> str:
     """Render markdown text to HTML."""
-    _md.reset()
-    return _md.convert(text)
+    if len(text) > RENDER_MD_CACHE_MAX_LEN:
+        return _convert_md(text)
+    return _convert_md_cached(text)
 
 
 # ---------------------------------------------------------------------------
 # Date formatting
 # ---------------------------------------------------------------------------
 
-def format_date(dt_str: str | None) -> str:
-    if not dt_str:
+def format_date(dt_value: datetime | str | None) -> str:
+    if not dt_value:
         return ""
+    if isinstance(dt_value, datetime):
+        return dt_value.strftime("%b %d, %Y %I:%M %p")
     try:
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+        # fromisoformat accepts a trailing "Z" since Python 3.11
+        dt = datetime.fromisoformat(dt_value)
         return dt.strftime("%b %d, %Y %I:%M %p")
     except Exception:
-        return dt_str or ""
+        return dt_value
 
 
 # ---------------------------------------------------------------------------
@@ -339,33 +375,7 @@ HTML_TEMPLATE = Template(r"""<!DOCTYPE html>
     <span class="message-time">{{ group.timestamp_fmt }}</span>
     {{ 'User' if group.type == 'user' else 'Assistant' }}
   </div>
-  {% for block in group.blocks %}
-    {% if block.type == 'text' %}
-      <div class="prose">{{ block.html }}</div>
-    {% elif block.type == 'thinking' %}
-      <div class="block-thinking">
-        <div class="block-label">Thinking</div>
-        <pre>{{ block.text[:3000] }}{% if block.text|length > 3000 %}<span class="truncated">... (truncated)</span>{% endif %}</pre>
-      </div>
-    {% elif block.type == 'reasoning' %}
-      <div class="block-reasoning">
-        <div class="block-label">Reasoning</div>
-        <pre>{{ block.text[:3000] }}{% if block.text|length > 3000 %}<span class="truncated">... (truncated)</span>{% endif %}</pre>
-      </div>
-    {% elif block.type in ('tool_use', 'function_call') %}
-      <div class="block-tool-use">
-        <div class="block-tool-name">Tool: {{ block.name }}</div>
-        <pre>{{ block.input[:2000] }}{% if block.input|length > 2000 %}<span class="truncated">... (truncated)</span>{% endif %}</pre>
-      </div>
-    {% elif block.type in ('tool_result', 'function_call_output') %}
-      <div class="block-tool-result">
-        <div class="block-label">Tool Result</div>
-        <pre>{{ block.output[:2000] }}{% if block.output|length > 2000 %}<span class="truncated">... (truncated)</span>{% endif %}</pre>
-      </div>
-    {% else %}
-      <pre>{{ block.text or '' }}</pre>
-    {% endif %}
-  {% endfor %}
+  {{ group.blocks_html }}
 </div>
 {% endfor %}
 {% endfor %}
@@ -408,15 +418,67 @@ def _group_messages(messages: list[dict]) -> list[dict]:
     return groups
 
 
-def generate_pdf(sessions_data: list[dict]) -> bytes:
-    """Generate a PDF from a list of session dicts.
-
-    Each dict should have keys: source, display, project, cwd, model,
-    created_at, message_count, messages (list of message dicts with
-    type, content, timestamp).
+# Block field shown in a <pre>, and the number of characters kept, per type
+_TRUNCATED_FIELDS = {
+    "thinking": ("text", 3000),
+    "reasoning": ("text", 3000),
+    "tool_use": ("input", 2000),
+    "function_call": ("input", 2000),
+    "tool_result": ("output", 2000),
+    "function_call_output": ("output", 2000),
+}
+
+# HTML per block type, filled with the escaped name and field value
+_TOOL_USE_HTML = (
+    '<div class="block-tool-use"><div class="block-tool-name">Tool: {name}</div>'
+    '<pre>{value}{truncated}</pre></div>'
+)
+_TOOL_RESULT_HTML = (
+    '<div class="block-tool-result"><div class="block-label">Tool Result</div>'
+    '<pre>{value}{truncated}</pre></div>'
+)
+_BLOCK_HTML = {
+    "thinking": (
+        '<div class="block-thinking"><div class="block-label">Thinking</div>'
+        '<pre>{value}{truncated}</pre></div>'
+    ),
+    "reasoning": (
+        '<div class="block-reasoning"><div class="block-label">Reasoning</div>'
+        '<pre>{value}{truncated}</pre></div>'
+    ),
+    "tool_use": _TOOL_USE_HTML,
+    "function_call": _TOOL_USE_HTML,
+    "tool_result": _TOOL_RESULT_HTML,
+    "function_call_output": _TOOL_RESULT_HTML,
+}
+_TRUNCATED_HTML = '<span class="truncated">... (truncated)</span>'
+
+
+def _render_block(block: dict) -> str:
+    """Render one content block to HTML.
+
+    Done in Python rather than per block in the template, which made Jinja
+    dispatch on the block type for every block.
     """
-    template_sessions = []
+    block_type = block["type"]
+    if block_type == "text":
+        return f'<div class="prose">{render_md(block["text"])}</div>'
+
+    if block_type in _BLOCK_HTML:
+        field, limit = _TRUNCATED_FIELDS[block_type]
+        value = str(block[field])
+        return _BLOCK_HTML[block_type].format(
+            name=html.escape(block.get("name", "")),
+            value=html.escape(value[:limit], quote=False),
+            truncated=_TRUNCATED_HTML if len(value) > limit else "",
+        )
+
+    return f'<pre>{html.escape(block.get("text") or "", quote=False)}</pre>'
 
+
+def _iter_template_sessions(sessions_data: list[dict]) -> Iterator[dict]:
+    """Yield template-ready sessions one at a time, so only the session
+    being rendered has its parsed blocks and HTML held in memory."""
     for sess in sessions_data:
         messages = sess.get("messages", [])
 
@@ -430,24 +492,22 @@ def generate_pdf(sessions_data: list[dict]) -> bytes:
         # Group messages
         groups = _group_messages(parsed_messages)
 
-        # Build template-ready groups
+        # Build template-ready groups, with their blocks already rendered
         template_groups = []
         for group in groups:
-            all_blocks = []
-            for msg in group["messages"]:
-                for block in msg.get("_blocks", []):
-                    # Render markdown for text blocks
-                    if block["type"] == "text":
-                        block = {**block, "html": render_md(block["text"])}
-                    all_blocks.append(block)
+            blocks_html = "".join(
+                _render_block(block)
+                for msg in group["messages"]
+                for block in msg.get("_blocks", [])
+            )
 
             template_groups.append({
                 "type": group["type"],
                 "timestamp_fmt": format_date(group["timestamp"]),
-                "blocks": all_blocks,
+                "blocks_html": blocks_html,
             })
 
-        template_sessions.append({
+        yield {
             "source": sess.get("source", ""),
             "display": sess.get("display", ""),
             "project": sess.get("project", ""),
@@ -456,8 +516,31 @@ def generate_pdf(sessions_data: list[dict]) -> bytes:
             "created_at_fmt": format_date(sess.get("created_at", "")),
             "message_count": sess.get("message_count", 0),
             "message_groups": template_groups,
-        })
+        }
 
-    html_str = HTML_TEMPLATE.render(sessions=template_sessions)
-    pdf_bytes = HTML(string=html_str).write_pdf()
-    return pdf_bytes
+
+def generate_pdf(sessions_data: list[dict], target: BinaryIO | None = None) -> bytes | None:
+    """Generate a PDF from a list of session dicts.
+
+    Each dict should have keys: source, display, project, cwd, model,
+    created_at, message_count, messages (list of message dicts with
+    type, content, timestamp). Timestamps may be datetimes or ISO strings.
+
+    If ``target`` is given the PDF is written to it and None is returned,
+    otherwise the PDF bytes are returned.
+    """
+    # Stream the rendered HTML into a temp file instead of building one large
+    # string alongside every session's parsed blocks
+    with tempfile.TemporaryFile() as html_file:
+        HTML_TEMPLATE.stream(sessions=_iter_template_sessions(sessions_data)).dump(html_file, encoding="utf-8")
+        html_file.seek(0)
+        return HTML(file_obj=html_file, encoding="utf-8").write_pdf(target)
+
+
+def render_pdf_file(sessions_data: list[dict], path: str) -> None:
+    """Render sessions into a PDF file at ``path``.
+
+    Module-level so a process pool can pickle it by reference.
+    """
+    with open(path, "wb") as f:
+        generate_pdf(sessions_data, f)
@@ -1,18 +1,20 @@
 """JSONL file utilities."""
-import json
 import logging
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import AsyncIterator, Any
+from typing import Any, Iterator
 
-import aiofiles
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
-async def read_jsonl(file_path: Path) -> AsyncIterator[dict[str, Any]]:
+def iter_jsonl(file_path: Path) -> Iterator[dict[str, Any]]:
     """
-    Async generator to read JSONL file line by line.
+    Read a JSONL file and parse it line by line.
+
+    Synchronous so parsers can run the whole read + parse in a worker thread.
 
     Args:
         file_path: Path to JSONL file
@@ -21,23 +23,44 @@ async def read_jsonl(file_path: Path) -> AsyncIterator[dict[str, Any]]:
         Parsed JSON objects
     """
     try:
-        async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-            line_num = 0
-            async for line in f:
-                line_num += 1
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"[JSONL] Failed to parse line {line_num} in {file_path}: {e}")
-                    continue
+        # Read raw bytes in one call: session files are small enough to hold
+        # whole, and orjson parses UTF-8 directly, so decoding each line to
+        # str first would only be re-encoded internally
+        data = Path(file_path).read_bytes()
     except Exception as e:
         logger.error(f"[JSONL] Failed to read {file_path}: {e}")
         raise
 
+    for line_num, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"[JSONL] Failed to parse line {line_num} in {file_path}: {e}")
+            continue
+
+
+def parse_timestamp(timestamp_str: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp from a JSONL entry.
+
+    fromisoformat accepts a trailing "Z" since Python 3.11, so the string
+    needs no rewriting first. Malformed values fall back to the current time.
+
+    Args:
+        timestamp_str: Timestamp string, e.g. "2025-01-01T12:00:00.000Z"
+
+    Returns:
+        Parsed datetime
+    """
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except (ValueError, TypeError):
+        return datetime.utcnow()
+
 
 _XML_TAG_RE = re.compile(r'<[^>]+>')
 _SYSTEM_PREFIXES = (
@@ -52,13 +75,18 @@ _SYSTEM_PREFIXES = (
 
 def strip_xml_tags(text: str) -> str:
     """Strip XML/HTML-style tags from text."""
+    # Most messages have no tags; the substring scan is far cheaper than
+    # running the regex over the whole text
+    if '<' not in text:
+        return text.strip()
     return _XML_TAG_RE.sub('', text).strip()
 
 
 def is_system_message(text: str) -> bool:
     """Check if text looks like a system/environment message that should be skipped."""
-    stripped = text.strip()
-    return any(stripped.startswith(prefix) for prefix in _SYSTEM_PREFIXES)
+    # startswith() checks the whole tuple in one C call; lstrip() only
+    # copies when there is leading whitespace
+    return text.lstrip().startswith(_SYSTEM_PREFIXES)
 
 
 def create_content_preview(content: str | dict, max_length: int = 200) -> str:
@@ -73,7 +101,7 @@ def create_content_preview(content: str | dict, max_length: int = 200) -> str:
         Preview string
     """
     if isinstance(content, dict):
-        content = json.dumps(content)
+        content = orjson.dumps(content).decode()
 
     if len(content) <= max_length:
         return content
@@ -110,4 +138,4 @@ def extract_text_from_content(content: dict | str) -> str:
             return content_list
 
     # Fallback: convert to JSON string
-    return json.dumps(content)
+    return orjson.dumps(content).decode()
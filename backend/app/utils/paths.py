@@ -1,8 +1,13 @@
 """Path encoding/decoding utilities."""
+import functools
 import re
 from pathlib import Path
 
+# Lowercase hyphenated UUID, as Claude names its session files
+_SESSION_ID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
 
+
+@functools.lru_cache(maxsize=1024)
 def decode_project_path(encoded: str) -> str:
     """
     Decode a project path from Claude's encoding format.
@@ -71,9 +76,17 @@ def get_project_from_path(file_path: Path, cwd: str | None = None) -> str | None
     if cwd:
         return cwd
 
-    parts = file_path.parts
-
     # Fallback: decode from Claude project directory name
+    return _project_from_dir(str(file_path.parent))
+
+
+@functools.lru_cache(maxsize=1024)
+def _project_from_dir(dir_path: str) -> str | None:
+    """Decode the project from a session file's directory.
+
+    Cached by directory since a project's sessions all share one.
+    """
+    parts = Path(dir_path).parts
     try:
         projects_idx = parts.index("projects")
         if projects_idx + 1 < len(parts):
@@ -99,7 +112,7 @@ def get_session_id_from_path(file_path: Path) -> str | None:
     stem = file_path.stem
 
     # Validate it looks like a UUID
-    if re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', stem):
+    if _SESSION_ID_RE.fullmatch(stem):
         return stem
 
     return None
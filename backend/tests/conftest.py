@@ -0,0 +1,54 @@
+"""Shared test fixtures.
+
+The app reads its settings and creates its database engines at import time,
+so point them at a throwaway directory before anything imports ``app``.
+"""
+import os
+import tempfile
+
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="sessionviewer-tests-")
+os.environ["DATA_DIR"] = _TEST_DATA_DIR
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TEST_DATA_DIR}/sessions.db"
+os.environ["REINDEX_INTERVAL_MINUTES"] = "0"
+
+import pytest  # noqa: E402
+from sqlalchemy import delete  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import init_db, read_engine, write_engine, write_session  # noqa: E402
+from app.models import Session  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio, the loop the app is served on."""
+    return "asyncio"
+
+
+@pytest.fixture
+def source_dirs(tmp_path, monkeypatch):
+    """Empty Claude and Codex directories the indexer scans."""
+    claude_dir = tmp_path / "claude"
+    codex_dir = tmp_path / "codex"
+    (claude_dir / "projects").mkdir(parents=True)
+    (codex_dir / "sessions").mkdir(parents=True)
+    monkeypatch.setattr(settings, "claude_dir", claude_dir)
+    monkeypatch.setattr(settings, "codex_dir", codex_dir)
+    return claude_dir, codex_dir
+
+
+@pytest.fixture
+async def db(anyio_backend):
+    """A write session on a freshly initialized database, emptied afterwards."""
+    await init_db()
+    async with write_session() as session:
+        yield session
+
+    # Messages, subagents and files go with their session through ON DELETE CASCADE
+    async with write_session() as session:
+        await session.execute(delete(Session))
+        await session.commit()
+
+    # Each test runs on its own event loop; don't hand pooled connections to the next
+    await read_engine.dispose()
+    await write_engine.dispose()
@@ -0,0 +1,59 @@
+"""Tests for the PDF export worker pool."""
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+try:
+    from app.routers import export
+except (ImportError, OSError):  # WeasyPrint needs pango at import time
+    pytest.skip("WeasyPrint system libraries are not installed", allow_module_level=True)
+
+
+class _FakePool(ThreadPoolExecutor):
+    """Stand-in worker pool; the first one created behaves as if a worker died."""
+
+    created: list["_FakePool"] = []
+
+    def __init__(self, max_workers=None, mp_context=None):
+        super().__init__(max_workers=max_workers)
+        self.broken = not _FakePool.created
+        _FakePool.created.append(self)
+
+    def submit(self, fn, /, *args, **kwargs):
+        if not self.broken:
+            return super().submit(fn, *args, **kwargs)
+        # Fail after submission, so concurrent requests all land on the broken pool
+        future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+
+def _fake_render_pdf_file(sessions_data, path):
+    with open(path, "wb") as f:
+        f.write(b"%PDF-" + sessions_data[0]["id"].encode())
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    _FakePool.created = []
+    monkeypatch.setattr(export, "ProcessPoolExecutor", _FakePool)
+    monkeypatch.setattr(export, "render_pdf_file", _fake_render_pdf_file)
+    monkeypatch.setattr(export, "_pdf_pool", None)
+    yield _FakePool.created
+    for pool in _FakePool.created:
+        pool.shutdown(wait=True)
+
+
+@pytest.mark.anyio
+async def test_concurrent_renders_share_one_replacement_pool(fake_pool, tmp_path):
+    paths = [tmp_path / "a.pdf", tmp_path / "b.pdf"]
+    await asyncio.gather(*(
+        export._render_pdf([{"id": path.stem}], str(path)) for path in paths
+    ))
+
+    assert [path.read_bytes() for path in paths] == [b"%PDF-a", b"%PDF-b"]
+    # The second request must not tear down the pool the first one rebuilt
+    assert len(fake_pool) == 2
+    assert export._pdf_pool is fake_pool[1]
@@ -0,0 +1,111 @@
+"""Tests for the session indexer."""
+import asyncio
+import os
+from contextlib import aclosing
+
+import orjson
+import pytest
+from sqlalchemy import func, select
+
+from app.database import write_session
+from app.models import Message, Session
+from app.services.indexer import PARSE_CONCURRENCY, _parse_concurrently, index_all_sessions
+
+SESSION_ID = "11111111-1111-1111-1111-111111111111"
+OTHER_SESSION_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _write_claude_session(path, texts: list[str]) -> None:
+    """Write a Claude session file with one user message per text."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\n".join(
+        orjson.dumps({
+            "type": "user",
+            "timestamp": f"2026-01-01T00:00:{i:02d}Z",
+            "uuid": f"msg-{i}",
+            "message": {"role": "user", "content": text},
+        })
+        for i, text in enumerate(texts)
+    ))
+
+
+async def _message_counts(db) -> dict[str, int]:
+    result = await db.execute(
+        select(Message.session_id, func.count()).group_by(Message.session_id)
+    )
+    return dict(result.all())
+
+
+async def _index() -> dict[str, int]:
+    """Run an index pass on its own session, as the periodic re-index does."""
+    async with write_session() as session:
+        return await index_all_sessions(session)
+
+
+@pytest.mark.anyio
+async def test_changed_file_is_reindexed_and_unchanged_file_skipped(db, source_dirs):
+    claude_dir, _ = source_dirs
+    path = claude_dir / "projects" / "-work-viewer" / f"{SESSION_ID}.jsonl"
+    _write_claude_session(path, ["first", "second"])
+
+    assert (await _index())["claude_sessions"] == 1
+    assert (await _index())["claude_sessions"] == 0
+
+    _write_claude_session(path, ["rewritten", "and", "longer"])
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    counts = await _index()
+
+    assert counts["claude_sessions"] == 1
+    assert counts["errors"] == 0
+    session = (await db.execute(select(Session))).scalars().one()
+    assert (session.message_count, session.file_mtime_ns) == (3, mtime_ns)
+    # The previous index's messages went with the replaced row
+    result = await db.execute(select(Message.content).order_by(Message.sequence))
+    assert [orjson.loads(c)["content"] for c in result.scalars()] == ["rewritten", "and", "longer"]
+    assert await _message_counts(db) == {SESSION_ID: 3}
+
+
+@pytest.mark.anyio
+async def test_duplicate_session_id_rolls_back_only_its_savepoint(db, source_dirs):
+    claude_dir, _ = source_dirs
+    projects = claude_dir / "projects"
+    # Two projects hold a file with the same session id; whichever is
+    # written second violates the primary key
+    _write_claude_session(projects / "-a" / f"{SESSION_ID}.jsonl", ["first copy"])
+    _write_claude_session(projects / "-b" / f"{SESSION_ID}.jsonl", ["second copy", "again"])
+    _write_claude_session(projects / "-a" / f"{OTHER_SESSION_ID}.jsonl", ["unrelated"])
+
+    counts = await index_all_sessions(db)
+
+    assert counts["claude_sessions"] == 2
+    assert counts["errors"] == 1
+    sessions = {s.id: s for s in (await db.execute(select(Session))).scalars()}
+    assert set(sessions) == {SESSION_ID, OTHER_SESSION_ID}
+    # The failed copy's messages went with its savepoint
+    assert await _message_counts(db) == {
+        session_id: session.message_count for session_id, session in sessions.items()
+    }
+
+
+@pytest.mark.anyio
+async def test_parse_concurrently_cancels_in_flight_parses_on_close(anyio_backend, tmp_path):
+    started: list[asyncio.Task] = []
+
+    async def parse(path):
+        started.append(asyncio.current_task())
+        if path.name != "0":
+            await asyncio.sleep(60)
+        return {}
+
+    paths = [tmp_path / str(i) for i in range(PARSE_CONCURRENCY * 2)]
+    tasks_before = asyncio.all_tasks()
+    async with aclosing(_parse_concurrently(paths, parse)) as results:
+        async for path, _ in results:
+            break
+
+    # Nothing is left running behind the closed generator
+    assert asyncio.all_tasks() == tasks_before
+    assert len(started) == PARSE_CONCURRENCY
+    assert sum(task.cancelled() for task in started) == PARSE_CONCURRENCY - 1
@@ -0,0 +1,68 @@
+"""Tests for full-text session search."""
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import delete, text, update
+
+from app.database import init_db, write_session
+from app.models import Session
+from app.routers import sessions
+
+_app = FastAPI()
+_app.include_router(sessions.router)
+
+
+async def _search(term: str) -> list[str]:
+    transport = httpx.ASGITransport(app=_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/sessions", params={"search": term})
+    response.raise_for_status()
+    return [s["id"] for s in response.json()["sessions"]]
+
+
+def _session(session_id: str, display: str) -> Session:
+    now = datetime(2026, 1, 1)
+    return Session(
+        id=session_id,
+        source="claude",
+        project="/work/viewer",
+        display=display,
+        created_at=now,
+        updated_at=now,
+        message_count=0,
+        subagent_count=0,
+        file_path=f"/sessions/{session_id}.jsonl",
+    )
+
+
+@pytest.mark.anyio
+async def test_search_follows_updates_and_deletes(db):
+    db.add_all([_session("s1", "Fix the flaky parser"), _session("s2", "Add dark mode")])
+    await db.commit()
+    assert await _search("flaky") == ["s1"]
+
+    await db.execute(update(Session).where(Session.id == "s1").values(display="Speed up exports"))
+    await db.commit()
+    assert await _search("flaky") == []
+    assert await _search("exports") == ["s1"]
+
+    await db.execute(delete(Session).where(Session.id == "s1"))
+    await db.commit()
+    assert await _search("exports") == []
+    assert await _search("dark") == ["s2"]
+
+
+@pytest.mark.anyio
+async def test_startup_rebuilds_an_out_of_sync_index(db):
+    db.add(_session("s1", "Fix the flaky parser"))
+    await db.commit()
+    # Empty the index behind the triggers' back, as a rowid renumbering would
+    await db.execute(text("INSERT INTO sessions_fts(sessions_fts) VALUES ('delete-all')"))
+    await db.commit()
+    assert await _search("flaky") == []
+
+    await init_db()
+
+    assert await _search("flaky") == ["s1"]
@@ -65,6 +65,7 @@ export interface AssociatedFile {
 	file_type: 'todo' | 'plan' | 'debug';
 	content: string | null;
 	file_path: string;
+	truncated?: boolean;
 }
 
 export interface ProjectInfo {